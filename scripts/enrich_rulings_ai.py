@@ -1,21 +1,38 @@
 import datetime
-import json
+import html
 import logging
+import re
+from collections import Counter
 
 # from typing import List, Dict, Any, Optional # Replaced by built-in types or new syntax
-import uuid
 
-from bs4 import BeautifulSoup  # For stripping HTML if needed from original_html_snippet
+import orjson
 
 # We are working with dictionaries that conform to Ruling/Provenance models
 # but won't strictly parse them with Pydantic here to keep this script simpler.
 # The Pydantic models are defined in `process_new_format.py`.
 
 from abyssal_tome import constants  # Updated import path
+from abyssal_tome.utils import load_retrieval_dates, stable_ruling_id, write_if_changed
 
 logging.basicConfig(level=logging.INFO)
 # DEFAULT_SOURCE_CARD_CODE_EXTERNAL is now in constants.py
 
+# A card code mentioned as "[01001]" or "card 01001" in external ruling text.
+CARD_CODE_MENTION_PATTERN = re.compile(r"\[(\d{5})\]|card (\d{5})")
+# HTML comments and tags; what is left between them is the snippet's text. A tag has to start with a name, "/" or "!",
+# so a bare "<" in plain text (e.g. "cost < 3 or > 1") is kept, as html.parser does.
+HTML_MARKUP_PATTERN = re.compile(r"<!--.*?-->|<[A-Za-z/!][^>]*>", re.DOTALL)
+
+
+def html_to_text(snippet: str) -> str:
+    """
+    Reduce an HTML snippet to its plain text, like BeautifulSoup's `get_text(separator=" ", strip=True)`.
+
+    The text between tags is unescaped and stripped, and the non-empty pieces are joined with single spaces. The snippets are simple ArkhamDB FAQ markup, so a single regex split is enough and much cheaper than building a parse tree for every ruling.
+    """
+    return " ".join(text for part in HTML_MARKUP_PATTERN.split(snippet) if (text := html.unescape(part).strip()))
+
 # --- Placeholder AI Functions ---
 
 
@@ -28,7 +45,9 @@ def ai_get_related_cards(
     Returns a sorted list of related card codes, potentially adding a simulated new code based on keywords in the ruling text and excluding the source card code.
     """
     logging.info(
-        f"AI_PLACEHOLDER: Identifying related cards for text (source: {source_card_code}): '{ruling_text[:100]}...'"
+        "AI_PLACEHOLDER: Identifying related cards for text (source: %s): '%.100s...'",
+        source_card_code,
+        ruling_text,
     )
     # Simulate finding one new card code not already present
     # In a real scenario, this would involve an LLM call.
@@ -54,7 +73,7 @@ def ai_extract_provenance_details(
     
     If the ruling text references a Discord ruling, updates the provenance dictionary with a specific source type, source name, and a simulated source date. Returns the updated provenance dictionary.
     """
-    logging.info(f"AI_PLACEHOLDER: Extracting provenance for: '{ruling_text[:100]}...'")
+    logging.info("AI_PLACEHOLDER: Extracting provenance for: '%.100s...'", ruling_text)
     updated_provenance = existing_provenance.copy()
     if "discord ruling" in ruling_text.lower():
         updated_provenance["source_type"] = "discord_community_ruling"
@@ -74,8 +93,9 @@ def ai_extract_q_and_a(raw_text: str) -> dict[str, str] | None:
     Returns:
         dict: A dictionary with "question" and "answer" keys if extraction is successful; otherwise, None.
     """
-    logging.info(f"AI_PLACEHOLDER: Extracting Q&A from: '{raw_text[:100]}...'")
-    if raw_text.lower().startswith("q:") and "a:" in raw_text.lower():
+    logging.info("AI_PLACEHOLDER: Extracting Q&A from: '%.100s...'", raw_text)
+    lowered_text = raw_text.lower()
+    if lowered_text.startswith("q:") and "a:" in lowered_text:
         parts = raw_text.split("A:", 1) if "A:" in raw_text else raw_text.split("a:", 1)
         question = parts[0][2:].strip()
         answer = parts[1].strip() if len(parts) > 1 else ""
@@ -97,7 +117,7 @@ def ai_generate_tags(ruling_text: str, existing_tags: list[str]) -> list[str]:
     Returns:
         list[str]: A sorted list of tags including both existing and newly generated tags.
     """
-    logging.info(f"AI_PLACEHOLDER: Generating tags for: '{ruling_text[:100]}...'")
+    logging.info("AI_PLACEHOLDER: Generating tags for: '%.100s...'", ruling_text)
     new_tags = set(existing_tags)
     if "timing" in ruling_text.lower():
         new_tags.add("timing_window")
@@ -111,27 +131,43 @@ def ai_generate_tags(ruling_text: str, existing_tags: list[str]) -> list[str]:
 
 def convert_external_ruling_to_standard_format(
     external_ruling: dict[str, any],
+    occurrence: int = 0,
+    previous_retrieval_dates: dict[str, str] | None = None,
 ) -> dict[str, any] | None:
     """
     Convert a raw external ruling dictionary into a standardized ruling format.
     
-    Attempts to extract provenance details and question/answer structure using AI placeholder functions. Assigns a unique ID, determines the source card code from the text if possible, and sets the ruling type based on whether a Q&A structure is detected. Returns the standardized ruling dictionary, or None if the input lacks required raw text.
+    Attempts to extract provenance details and question/answer structure using AI placeholder functions. Assigns an ID derived from the ruling's source, text and `occurrence` (the number of identical entries before it), determines the source card code from the text if possible, and sets the ruling type based on whether a Q&A structure is detected. Returns the standardized ruling dictionary, or None if the input lacks required raw text.
     """
     raw_text = external_ruling.get("raw_text")
     if not raw_text:
         logging.warning(
-            f"External ruling skipped due to missing raw_text: {external_ruling.get('source_url_or_context')}"
+            "External ruling skipped due to missing raw_text: %s",
+            external_ruling.get("source_url_or_context"),
         )
         return None
 
+    # Derived from where the ruling came from and what it says, so reruns keep the same id.
+    # Identical entries from the same source are told apart by their position.
+    ruling_id = stable_ruling_id(
+        external_ruling.get("source_type_hint"),
+        external_ruling.get("source_url_or_context"),
+        raw_text,
+        str(occurrence),
+    )
+    retrieval_date = external_ruling.get("retrieval_date_utc")
+    if retrieval_date is None:
+        # Without a date in the input, a ruling seen on an earlier run keeps the date it was first retrieved,
+        # so an unchanged input gives an unchanged file
+        previous_date = (previous_retrieval_dates or {}).get(ruling_id)
+        retrieval_date = previous_date or datetime.datetime.utcnow().isoformat()
+
     # Initial Provenance from external source structure
     provenance = {
         "source_type": external_ruling.get("source_type_hint", "unknown_external"),
         "source_name": None,  # To be filled by AI or manual review
         "source_date": None,  # To be filled by AI or manual review
-        "retrieval_date": external_ruling.get(
-            "retrieval_date_utc", datetime.datetime.utcnow().isoformat()
-        ),
+        "retrieval_date": retrieval_date,
         "source_url": external_ruling.get("source_url_or_context"),
     }
 
@@ -141,7 +177,6 @@ def convert_external_ruling_to_standard_format(
     # Try to structure Q&A
     extracted_qa = ai_extract_q_and_a(raw_text)
 
-    ruling_id = str(uuid.uuid4())
     standard_ruling = {
         "id": ruling_id,
         # Try to find a card code in the raw_text for source_card_code, otherwise use default.
@@ -156,9 +191,7 @@ def convert_external_ruling_to_standard_format(
     # Temp: simple check for mentioned card codes in raw_text to assign as source_card_code
     # A real version would use more robust NLP/AI.
     # Example: Look for "[01001]" or "card 01001"
-    import re
-
-    card_code_match = re.search(r"\[(\d{5})\]|card (\d{5})", raw_text)
+    card_code_match = CARD_CODE_MENTION_PATTERN.search(raw_text)
     if card_code_match:
         actual_code = card_code_match.group(1) or card_code_match.group(2)
         standard_ruling["source_card_code"] = actual_code
@@ -213,8 +246,7 @@ def enrich_rulings(rulings_data: list[dict[str, any]]) -> list[dict[str, any]]:
             # For already processed ArkhamDB rulings, original_html_snippet is HTML.
             # For external rulings, it's raw text.
             # We need plain text for AI.
-            soup = BeautifulSoup(enriched_ruling["original_html_snippet"], "html.parser")
-            text_for_ai = soup.get_text(separator=" ", strip=True)
+            text_for_ai = html_to_text(enriched_ruling["original_html_snippet"])
 
         if not text_for_ai and enriched_ruling.get(
             "original_html_snippet"
@@ -223,7 +255,7 @@ def enrich_rulings(rulings_data: list[dict[str, any]]) -> list[dict[str, any]]:
 
         if not text_for_ai:
             logging.warning(
-                f"Skipping AI enrichment for ruling ID {enriched_ruling.get('id')} due to no text."
+                "Skipping AI enrichment for ruling ID %s due to no text.", enriched_ruling.get("id")
             )
             enriched_rulings.append(enriched_ruling)
             continue
@@ -283,12 +315,11 @@ def main() -> None:
         )
     else:
         try:
-            with processed_input_path.open("r", encoding="utf-8") as f:
-                all_rulings_to_process.extend(json.load(f))
+            all_rulings_to_process.extend(orjson.loads(processed_input_path.read_bytes()))
             logging.info(
                 f"Loaded {len(all_rulings_to_process)} rulings from {processed_input_path}"
             )
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logging.error(f"Error decoding JSON from {processed_input_path}: {e}")
             return
         except OSError as e:
@@ -302,15 +333,24 @@ def main() -> None:
         )
     else:
         try:
-            with external_input_path.open("r", encoding="utf-8") as f:
-                raw_external_data = json.load(f)
+            raw_external_data = orjson.loads(external_input_path.read_bytes())
             logging.info(
                 f"Loaded {len(raw_external_data)} raw external entries from {external_input_path}"
             )
 
+            previous_retrieval_dates = load_retrieval_dates(output_path)
+            occurrences: Counter[tuple] = Counter()
             converted_external_rulings = []
             for ext_ruling_dict in raw_external_data:
-                standardized = convert_external_ruling_to_standard_format(ext_ruling_dict)
+                identity = (
+                    ext_ruling_dict.get("source_type_hint"),
+                    ext_ruling_dict.get("source_url_or_context"),
+                    ext_ruling_dict.get("raw_text"),
+                )
+                standardized = convert_external_ruling_to_standard_format(
+                    ext_ruling_dict, occurrences[identity], previous_retrieval_dates
+                )
+                occurrences[identity] += 1
                 if standardized:
                     converted_external_rulings.append(standardized)
 
@@ -319,7 +359,7 @@ def main() -> None:
             )
             all_rulings_to_process.extend(converted_external_rulings)
 
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logging.error(f"Error decoding JSON from {external_input_path}: {e}")
         except OSError as e:
             logging.error(f"Error reading from {external_input_path}: {e}")
@@ -328,13 +368,18 @@ def main() -> None:
     final_rulings = enrich_rulings(all_rulings_to_process)
 
     try:
-        with output_path.open("w", encoding="utf-8") as f:
-            json.dump(
-                final_rulings, f, indent=2, ensure_ascii=False, default=str
-            )  # Add default=str for any non-serializable types like datetime
-        logging.info(
-            f"Successfully enriched a total of {len(final_rulings)} rulings and saved to {output_path}"
-        )
+        # Datetimes are passed through to default=str so they keep the "YYYY-MM-DD HH:MM:SS" form json.dumps wrote.
+        output_text = orjson.dumps(
+            final_rulings,
+            default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+        ).decode("utf-8")
+        if write_if_changed(output_path, output_text):
+            logging.info(
+                f"Successfully enriched a total of {len(final_rulings)} rulings and saved to {output_path}"
+            )
+        else:
+            logging.info("Enriched rulings unchanged; leaving %s as is.", output_path)
     except OSError as e:
         logging.error(f"Error writing enriched rulings to {output_path}: {e}")
 
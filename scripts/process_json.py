@@ -1,30 +1,38 @@
+import codecs
 import datetime
 import json
 import logging
+import re
+from concurrent.futures import ProcessPoolExecutor
 from enum import StrEnum, unique
+from functools import partial
 from pathlib import Path
 
-import regex as re
+import orjson
 
 PLAYER_CARDS_PATH = Path(r"../player_cards.json")
 OTHER_CARDS_PATH = Path(r"../other_cards.json")
 FAQS_PATH = Path(r"../faqs")
 PROCESSED_DATA_PATH = Path(r"../assets/processed_data.json")
 
-# NB_PATTERN = re.compile(
-#     r"\*\*NB:\*\* ArkhamDB now incorporates errata from the Arkham Horror FAQ in its card text, so the ArkhamDB text and the card image above differ, as the ArkhamDB text has been edited to contain this erratum \(updated .+?\):\s?")
+NB_PATTERN = re.compile(
+    r"\*\*NB:\*\* ArkhamDB now incorporates errata from the Arkham Horror FAQ in its card text, so the ArkhamDB text and the card image above differ, as the ArkhamDB text has been edited to contain this erratum \(updated .+?\):\s?")
 
-# FAQ_PATTERN = re.compile(r"(FAQ),\sv\.(\d+\.\d+),\s(\w+\s\d{4})$")
-# FAQ_PATTERN = re.compile(r"(FAQ),\sv\.(\d+\.\d+),\s(\w+\s\d{4})")
+FAQ_PATTERN = re.compile(r"(FAQ),\sv\.(\d+\.\d+),\s(\w+\s\d{4})")
 
+SPLIT_RULINGS_PATTERN = re.compile(r"- (?!\bFAQ\b)")
 
-# STRIKETHROUGH_PATTERN = re.compile(r"~~.*?~~|<s>.*?</s>|<strike>.*?</strike>")
-# ESCAPED_DOUBLE_QUOTES_PATTERN = re.compile(r'\\"')
-# ESCAPED_ASTERISK_PATTERN = re.compile(r"\*")
-# ESCAPED_UNDERSCORE_PATTERN = re.compile(r"\_")
-# BOLD_TAGS_PATTERN = re.compile(r"<b>|</b>")
-# ITALIC_TAGS_PATTERN = re.compile(r"<i>|</i>")
-# NEWLINE_PATTERN = re.compile(r"\\n")
+STRIKETHROUGH_PATTERN = re.compile(r"~~.*?~~|<s>.*?</s>|<strike>.*?</strike>")
+# Escaped double quotes, HTML bold/italic tags and literal "\n" sequences, rewritten in a single pass by MARKUP_REPLACEMENTS.
+MARKUP_PATTERN = re.compile(r'\\"|</?b>|</?i>|\\n')
+MARKUP_REPLACEMENTS = {
+    '\\"': '"',
+    "<b>": "**",
+    "</b>": "**",
+    "<i>": "*",
+    "</i>": "*",
+    "\\n": "",
+}
 
 
 @unique
@@ -34,7 +42,7 @@ class EntryType(StrEnum):
     CLARIFICATION = "clarification"
 
 
-def parse_text(text) -> None:
+def parse_text(text) -> tuple[str, str | None, str | None, str | None]:
     """
     Extracts FAQ reference metadata from the input text and returns the cleaned text along with source type, version, and date.
     
@@ -43,22 +51,18 @@ def parse_text(text) -> None:
     """
     source_type = version = date = None
 
-    # Find all FAQ references in the text
-    faq_references = re.findall(FAQ_PATTERN, text)
+    # Find all FAQ references in the text; the last one provides the source type, version, and date
+    if faq_references := FAQ_PATTERN.findall(text):
+        source_type, version, date = faq_references[-1]
 
-    # Loop over all FAQ references
-    for faq_reference in faq_references:
-        # Extract the source type, version, and date from the match
-        source_type, version, date = faq_reference
-
-        # Remove the matched string from the text
-        text = re.sub(FAQ_PATTERN, "", text)
+        # Remove every matched reference from the text in one pass
+        text = FAQ_PATTERN.sub("", text)
 
     # Strip leading and trailing whitespace from the text
     text = text.strip()
 
-    logging.info(f"Processed text: {text}")
-    logging.info(f"Extracted source type: {source_type}, version: {version}, date: {date}")
+    logging.info("Processed text: %s", text)
+    logging.info("Extracted source type: %s, version: %s, date: %s", source_type, version, date)
 
     return text, source_type, version, date
 
@@ -76,37 +80,31 @@ def load_card_names(*card_files):
     return {
         card_code: card_details.get("name", "Unknown Card")
         for cards_file in card_files
-        for set_value in json.load(open(cards_file, encoding="utf-8-sig")).values()
+        for set_value in orjson.loads(Path(cards_file).read_bytes().removeprefix(codecs.BOM_UTF8)).values()
         for card_type_value in set_value.values()
         for card_code, card_details in card_type_value.items()
     }
 
 
-def process_ruling(ruling, item_code, updated_at=None):
+def process_ruling(ruling, item_code, card_name, updated_at=None):
     """
     Process and clean a single ruling entry, extracting metadata, formatting text, and categorizing the entry.
     
     Removes formatting artifacts, extracts FAQ references, reformats update timestamps, and determines the entry type (erratum, question/answer, or clarification). Returns a structured dictionary with cleaned content, source metadata, card name, and card code, or None if the ruling is empty or overruled.
-    logging.info(f"Original ruling: {ruling}, updated_at: {updated_at}")
+    """
+    logging.info("Original ruling: %s, updated_at: %s", ruling, updated_at)
 
     # Remove strikethrough text in Markdown and HTML
     ruling = STRIKETHROUGH_PATTERN.sub("", ruling)
 
     ruling, source_type, version, date = parse_text(ruling)
     if not ruling.strip():  # Skip rulings that only contain an FAQ reference
-        logging.warning(f"Ruling is empty: {ruling} for card {item_code}")
+        logging.warning("Ruling is empty: %s for card %s", ruling, item_code)
 
     ruling = NB_PATTERN.sub("", ruling)
 
-    # Remove escaped double quotes
-    ruling = ESCAPED_DOUBLE_QUOTES_PATTERN.sub('"', ruling)
-
-    ruling = ESCAPED_ASTERISK_PATTERN.sub(r"*", ruling)
-    ruling = ESCAPED_UNDERSCORE_PATTERN.sub(r"_", ruling)
-
-    ruling = BOLD_TAGS_PATTERN.sub("**", ruling)  # Replace HTML bold tags with Markdown
-    ruling = ITALIC_TAGS_PATTERN.sub("*", ruling)  # Replace HTML italic tags with Markdown
-    ruling = NEWLINE_PATTERN.sub("", ruling)  # Strip newline characters
+    # Unescape double quotes, turn HTML bold/italic tags into Markdown and strip newline sequences, all in one pass
+    ruling = MARKUP_PATTERN.sub(lambda match: MARKUP_REPLACEMENTS[match[0]], ruling)
 
     # Format updated_at to "DD <month_name> YYYY"
     if updated_at:
@@ -114,7 +112,7 @@ def process_ruling(ruling, item_code, updated_at=None):
             updated_at_date = datetime.datetime.strptime(updated_at, "%Y-%m-%dT%H:%M:%S.%fZ")
             updated_at = updated_at_date.strftime("%d %B %Y")
         except ValueError:
-            logging.warning(f"Could not parse updated_at: {updated_at}")
+            logging.warning("Could not parse updated_at: %s", updated_at)
 
     if not ruling:
         return None
@@ -152,7 +150,7 @@ def process_ruling(ruling, item_code, updated_at=None):
         "type": entry_type,
         "content": {"text": ruling, "question": question, "answer": answer},
         "source": source,
-        "card_name": card_names.get(item_code, "Unknown Card"),
+        "card_name": card_name,
         "card_code": item_code,
     }
 
@@ -169,41 +167,25 @@ def process_json_file(file_path, card_names):  # Fallback to current time if not
         dict: A dictionary mapping card names to lists of processed ruling entries.
     """
     try:
-        with open(file_path) as file:
-            data = json.load(file)
-    except (FileNotFoundError, json.JSONDecodeError) as e:
-        logging.error(f"Error reading file {file_path}: {e}")
+        data = orjson.loads(Path(file_path).read_bytes())
+    except (FileNotFoundError, orjson.JSONDecodeError) as e:
+        logging.error("Error reading file %s: %s", file_path, e)
         return {}
 
     processed_data = {}
     for item in data:
         try:
             text = item["text"]
-            # Split the text by "- " that appears after a period or at the beginning of the text,
-            # or when it is not followed by "FAQ" and not in a sentence with "reads:"
-            # Use regex module for variable-width look-behind
-            rulings = re.split(r"(?<=\.\s+|\A) - (?!\bFAQ\b)|(?<!\breads:\s*) - (?!\bFAQ\b)", text)
-            rulings = [ruling for ruling in rulings if not re.search(r"reads:.*$", ruling)]
-            # Split the text by "- " that appears after a period or at the beginning of the text,
-            # or when it is not preceded by "reads:" and not followed by "FAQ"
-            rulings = re.split(r"(?<=\.\s+|\A) - (?!\bFAQ\b)|(?<!reads:) - (?!\bFAQ\b)", text)
-            # Split the text by "- " that appears after a period or at the beginning of the text
-            # Use regex module for variable-width look-behind
-            rulings = re.split(r"(?<=\.\s+|\A) - (?!\bFAQ\b)|(?<!\breads:\s*) - (?!\bFAQ\b)", text)
-            # Split the text by "- " to get a list of rulings, ensuring it's not in the middle of a sentence
-            rulings = re.split(r"(?<!\w) - (?!\bFAQ\b)", text)[1:]
-            rulings = re.split(
-                r"- (?!\bFAQ\b)", text
-            )[
-                1:
-            ]  # Split the text by "- " not followed by "FAQ"  # Split the text by "- " to get a list of rulings
+            # Split the text by "- " not followed by "FAQ" to get a list of rulings
+            rulings = SPLIT_RULINGS_PATTERN.split(text)[1:]
+            card_name = card_names.get(item.get("code"), "Unknown Card")
             rulings_list = []
             for ruling in rulings:
-                if ruling := process_ruling(ruling, item.get("code"), item.get("updated_at")):
+                if ruling := process_ruling(ruling, item.get("code"), card_name, item.get("updated_at")):
                     rulings_list.append(ruling)
-            processed_data[card_names.get(item.get("code"), "Unknown Card")] = rulings_list
+            processed_data[card_name] = rulings_list
         except Exception as e:
-            logging.error(f"Error processing item {item}: {e}")
+            logging.error("Error processing item %s: %s", item, e)
 
     return processed_data
 
@@ -215,18 +197,30 @@ def categorize_entry(text):
     Returns:
         EntryType: The type of entry, such as ERRATUM, QUESTION_ANSWER, or CLARIFICATION, depending on the presence of identifying patterns in the text.
     """
-    patterns = {"**Erratum:**": EntryType.ERRATUM, "**Q:**": EntryType.QUESTION_ANSWER}
-    return next(
-        (entry_type for pattern, entry_type in patterns.items() if pattern in text),
-        EntryType.CLARIFICATION,
-    )
+    # An erratum marker wins over a question marker wherever the two appear, so check them in that order
+    if "**Erratum:**" in text:
+        return EntryType.ERRATUM
+    if "**Q:**" in text:
+        return EntryType.QUESTION_ANSWER
+    return EntryType.CLARIFICATION
+
+
+def main() -> None:
+    """
+    Process every FAQ file and write the combined rulings to `PROCESSED_DATA_PATH`.
+
+    The files are independent and processing them is CPU-bound regex work, so they are handled in parallel by a process pool. Results are merged in glob order, as before.
+    """
+    card_names = load_card_names(PLAYER_CARDS_PATH, OTHER_CARDS_PATH)
 
+    all_processed_data = {}
+    with ProcessPoolExecutor() as pool:
+        for processed_data in pool.map(partial(process_json_file, card_names=card_names), FAQS_PATH.glob("*faqs*.json")):
+            all_processed_data |= processed_data
 
-card_names = load_card_names(PLAYER_CARDS_PATH, OTHER_CARDS_PATH)
+    with open(PROCESSED_DATA_PATH, "w", encoding="utf-8") as f:
+        json.dump(all_processed_data, f, indent=4, ensure_ascii=False)
 
-all_processed_data = {}
-for file_path in FAQS_PATH.glob("*faqs*.json"):
-    all_processed_data |= process_json_file(file_path, card_names)
 
-with open(PROCESSED_DATA_PATH, "w", encoding="utf-8") as f:
-    json.dump(all_processed_data, f, indent=4, ensure_ascii=False)
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ import datetime
 import json
 import logging
 import uuid
+from collections import Counter
 from enum import Enum, auto  # Added StrEnum
 from pathlib import Path
 from pprint import pp
@@ -21,32 +22,9 @@ logging.basicConfig(level=logging.INFO)
 # Constants moved to constants.py, except for TEXT_TO_RULING_TYPE
 # which are tightly coupled with this script's local RulingType enum.
 from abyssal_tome import constants  # Updated import path
+from abyssal_tome.utils import load_retrieval_dates, stable_ruling_id, write_if_changed
 
 # TAG_TO_LETTER moved to constants.py
-# TAG_TO_LETTER = {
-#     "willpower": "p",
-#     "agility": "a",
-#     "combat": "c",
-    "intellect": "b",
-    "skull": "k",
-    "cultist": "l",
-    "tablet": "q",
-    "elderthing": "n",
-    "autofail": "m",
-    "eldersign": "o",
-    "bless": "v",
-    "curse": "w",
-    "frost": "x",
-    "reaction": "!",
-    "unique": "s",
-    "mystic": "g",
-    "guardian": "f",
-    "seeker": "h",
-    "rogue": "d",
-    "survivor": "e",
-    "free": "j",
-    "action": "i",
-}
 
 
 class RulingType(Enum):
@@ -106,8 +84,6 @@ TEXT_TO_RULING_TYPE: dict[str, RulingType] = {
 # RULING_REMOVAL_PATTERNS and RULING_STRIP_PATTERNS moved to constants.py
 
 
-def load_faqs(faqs_path: Path) -> dict[str, dict[str, str]]:
-    # Path validation and loading logic
 def load_faqs(faqs_path: Path) -> dict[str, dict[str, str]]:
     """
     Load FAQ data from a JSON file after validating the file's existence, type, extension, and non-emptiness.
@@ -150,7 +126,7 @@ def convert_json_to_html(faq_data: dict[str, dict[str, str]]) -> dict[str, Beaut
     }
 
 
-def print_token_stream(tokens: List[md_it.token.Token], nest_level: int = 0) -> None:
+def print_token_stream(tokens: list[md_it.token.Token], nest_level: int = 0) -> None:
     for token in tokens:
         for i in range(nest_level):
             print(f"{' ' * 2 * i}Ã¢ÂÂ¾Ã¢ÂÂ¾Ã¢ÂÂ¾|")
@@ -452,14 +428,35 @@ def main() -> None:
 
     all_processed_rulings = process_html_faq_data(faq_data_full)
 
+    # Give every ruling an id derived from its content and keep the retrieval date of rulings seen on an earlier run,
+    # so reprocessing unchanged FAQs leaves the output file untouched.
+    previous_retrieval_dates = load_retrieval_dates(output_path)
+    occurrences: Counter[tuple] = Counter()
+    for ruling in all_processed_rulings:
+        identity = (
+            ruling.provenance.source_type,
+            ruling.source_card_code,
+            ruling.ruling_type.name,
+            ruling.question,
+            ruling.answer,
+            ruling.text,
+        )
+        # Identical rulings on the same card are told apart by their position
+        ruling.id = stable_ruling_id(*identity, str(occurrences[identity]))
+        occurrences[identity] += 1
+        if retrieval_date := previous_retrieval_dates.get(ruling.id):
+            ruling.provenance.retrieval_date = retrieval_date
+
     rulings_as_dicts = [
         ruling.model_dump(mode="json", exclude_none=True) for ruling in all_processed_rulings
     ]
 
     try:
-        with output_path.open("w", encoding="utf-8") as f:
-            json.dump(rulings_as_dicts, f, indent=2, ensure_ascii=False)
-        logging.info(f"Successfully processed rulings and saved to {output_path}")
+        output_text = json.dumps(rulings_as_dicts, indent=2, ensure_ascii=False)
+        if write_if_changed(output_path, output_text):
+            logging.info(f"Successfully processed rulings and saved to {output_path}")
+        else:
+            logging.info("Processed rulings unchanged; leaving %s as is.", output_path)
     except OSError as e:
         logging.error(f"Error writing processed rulings to {output_path}: {e}")
 
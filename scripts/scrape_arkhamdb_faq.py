@@ -1,6 +1,5 @@
 import asyncio
 import json
-import re
 
 import aiohttp
 import requests
@@ -8,6 +7,7 @@ import tqdm
 from tqdm.asyncio import tqdm_asyncio
 
 from abyssal_tome import constants # Updated import path
+from abyssal_tome.utils import write_if_changed
 
 # Regex patterns and cycles map moved to constants.py
 
@@ -85,12 +85,12 @@ def parse_faqs(faqs: list[dict[str, any] | None]) -> dict[str, dict[str, str]]:
             continue
 
         text = faq_content["html"]
-        text = re.sub(constants.SPAN_RULE_PATTERN, r"[\1]", text)
-        text = re.sub(constants.NEWLINE_RULE_PATTERN, "\n", text)
-        text = re.sub(constants.CARD_LINK_RULE_PATTERN, "/card/", text)
-        text = re.sub(constants.RULES_LINK_RULE_PATTERN, "/rules#", text)
-        text = re.sub(constants.PARAGRAPH_RULE_PATTERN, "", text)
-        text = re.sub(constants.CLOSE_PARAGRAPH_RULE_PATTERN, "", text)
+        text = constants.SPAN_RULE_PATTERN.sub(r"[\1]", text)
+        text = constants.NEWLINE_RULE_PATTERN.sub("\n", text)
+        text = constants.CARD_LINK_RULE_PATTERN.sub("/card/", text)
+        text = constants.RULES_LINK_RULE_PATTERN.sub("/rules#", text)
+        text = constants.PARAGRAPH_RULE_PATTERN.sub("", text)
+        text = constants.CLOSE_PARAGRAPH_RULE_PATTERN.sub("", text)
 
         updated_date = faq_content.get("updated", {}).get("date")
         if not updated_date:
@@ -129,9 +129,11 @@ async def main() -> None:
     output_file_path = constants.FAQS_FILE_PATH
     output_file_path.parent.mkdir(parents=True, exist_ok=True)  # Ensure directory exists
 
-    with output_file_path.open("w", encoding="utf-8") as f:
-        json.dump(parsed_faq_data, f, indent=2, ensure_ascii=False)
-    print(f"Successfully scraped and saved {len(parsed_faq_data)} FAQs to {output_file_path}")
+    output_text = json.dumps(parsed_faq_data, indent=2, ensure_ascii=False)
+    if write_if_changed(output_file_path, output_text):
+        print(f"Successfully scraped and saved {len(parsed_faq_data)} FAQs to {output_file_path}")
+    else:
+        print(f"Scraped {len(parsed_faq_data)} FAQs; {output_file_path} is already up to date.")
 
 
 if __name__ == "__main__":
@@ -1,26 +1,37 @@
 import asyncio
-import json
+import hashlib
 import logging
 import os
+import pickle
+import re
 import sys
+import threading
 from base64 import b64encode, urlsafe_b64decode, urlsafe_b64encode
-from copy import deepcopy
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import replace
 from enum import StrEnum, unique
+from functools import lru_cache, partial
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
 
+import aiohttp
 import clipman
 import flet as ft
 import flet_fastapi
-import regex as reg
+import orjson
 import requests
+from fastapi import FastAPI
 from gql import Client, gql
 from gql.transport.aiohttp import AIOHTTPTransport as GQL_Transport
 from starlette.middleware.cors import CORSMiddleware
 from tqdm.auto import tqdm
 from whoosh.fields import ID, TEXT, Schema
-from whoosh.index import create_in, open_dir
-from whoosh.writing import AsyncWriter
+from whoosh.index import FileIndex, create_in, exists_in, open_dir
 
+from .search import RULING_FORMAT_VERSION, Ruling, RulingSearchIndex
 from .utils import debounce  # Corrected relative import
 from . import constants  # Import constants from the package
 
@@ -38,9 +49,7 @@ schema = Schema(
     ruling_question=TEXT,
     ruling_answer=TEXT,
 )
-if not Path("indexdir").exists():
-    Path("indexdir").mkdir()
-ix = create_in("indexdir", schema)
+ix: FileIndex | None = None
 
 @unique
 class EntryType(StrEnum):
@@ -49,6 +58,10 @@ class EntryType(StrEnum):
     QUESTION_ANSWER = "question/answer"
     CLARIFICATION = "clarification"
 
+# Maps the stored type strings to EntryType so rendering can resolve a ruling's type with a dict lookup instead of
+# constructing the enum (and raising ValueError for unrecognised types) per ruling.
+ENTRY_TYPES = {entry_type.value: entry_type for entry_type in EntryType}
+
 @unique
 class QAType(StrEnum):
     QUESTION = "question"
@@ -56,43 +69,138 @@ class QAType(StrEnum):
 
 # Use TAG_TO_LETTER from constants to ensure consistency
 TAG_TO_LETTER = constants.TAG_TO_LETTER
+LETTER_TO_TAG = {icon_char: tag_name for tag_name, icon_char in TAG_TO_LETTER.items()}
+# Keyed by the bracketed token exactly as TAG_PATTERN matches it, e.g. "[willpower]".
+BRACKET_TAG_TO_LETTER = {f"[{tag_name}]": icon_char for tag_name, icon_char in TAG_TO_LETTER.items()}
 
-LINK_PATTERN = reg.compile(r"\[(?P<link_text>[^\[\]]+)\](?=\([^\)]+\))\((?P<link_url>[^\(\)]+)\)")
-TAG_PATTERN = reg.compile(
+LINK_PATTERN = re.compile(r"\[(?P<link_text>[^\[\]]+)\](?=\([^\)]+\))\((?P<link_url>[^\(\)]+)\)")
+TAG_PATTERN = re.compile(
     r"(?P<tag>"
-    + r"|".join(reg.escape(f"[{tag}]", special_only=True) for tag in constants.TAG_TO_LETTER)
+    + r"|".join(re.escape(f"[{tag}]") for tag in constants.TAG_TO_LETTER)
     + ")"
 )
-BOLD_ITALIC_PATTERN = reg.compile(r"\*\*\*(?P<bold_italic>.*?)\*\*\*")
-BOLD_PATTERN = reg.compile(r"\*\*(?P<bolded>.*?)\*\*")
-ITALIC_PATTERN = reg.compile(r"\*(?P<italics>.*?)\*")
-ALL_PATTERN = reg.compile(
+# Emphasis bodies use possessive negated classes instead of lazy `.*?`: each body stops at the first closing run of
+# asterisks (on the same line) exactly like the lazy form, but the engine never backtracks into it.
+BOLD_ITALIC_PATTERN = re.compile(r"\*\*\*(?P<bold_italic>[^*\n]*+(?:\*(?!\*\*)[^*\n]*+)*+)\*\*\*")
+BOLD_PATTERN = re.compile(r"\*\*(?P<bolded>[^*\n]*+(?:\*(?!\*)[^*\n]*+)*+)\*\*")
+ITALIC_PATTERN = re.compile(r"\*(?P<italics>[^*\n]*+)\*")
+ALL_PATTERN = re.compile(
     "|".join(
         pat.pattern
         for pat in (LINK_PATTERN, TAG_PATTERN, BOLD_ITALIC_PATTERN, BOLD_PATTERN, ITALIC_PATTERN)
     )
 )
 
+# Shared span styles. Flet only reads a TextStyle when serializing the span that uses it, so one instance can back every
+# span of that kind. Never mutate them in place; derive a new style with `dataclasses.replace` (see `highlighted_style`).
+PLAIN_STYLE = ft.TextStyle()
+BOLD_STYLE = ft.TextStyle(weight=ft.FontWeight.BOLD)
+ITALIC_STYLE = ft.TextStyle(italic=True)
+BOLD_ITALIC_STYLE = ft.TextStyle(weight=ft.FontWeight.BOLD, italic=True)
+LINK_STYLE = ft.TextStyle(decoration=ft.TextDecoration.UNDERLINE, color=ft.colors.PRIMARY)
+CARD_TITLE_STYLE = ft.TextStyle(decoration=ft.TextDecoration.UNDERLINE)
+ICON_STYLE = ft.TextStyle(size=20, font_family="Arkham Icons")
+HIGHLIGHT_BGCOLOR = ft.colors.with_opacity(0.5, ft.colors.TERTIARY)
+COPY_BUTTON_STYLE = ft.ButtonStyle(shape=ft.RoundedRectangleBorder(radius=10))
+COPY_BUTTON_COPIED_STYLE = ft.ButtonStyle(shape=ft.RoundedRectangleBorder(radius=10), bgcolor=HIGHLIGHT_BGCOLOR)
+# Style of each non-link segment kind produced by `parse_special_tags`.
+SEGMENT_STYLES = {
+    "text": PLAIN_STYLE,
+    "tag": ICON_STYLE,
+    "bold_italic": BOLD_ITALIC_STYLE,
+    "bolded": BOLD_STYLE,
+    "italics": ITALIC_STYLE,
+}
+# Keyed by id() because TextStyle is an unhashable dataclass; safe since the shared styles above live as long as the module.
+HIGHLIGHTED_STYLES = {
+    id(style): replace(style, bgcolor=HIGHLIGHT_BGCOLOR)
+    for style in (PLAIN_STYLE, BOLD_STYLE, ITALIC_STYLE, BOLD_ITALIC_STYLE, LINK_STYLE, ICON_STYLE)
+}
+
+# Remote lookups shared by every session: card code → image URL, card code → card text, and image URL → base64 image
+# (least recently used first).
+image_url_cache: dict[str, str] = {}
+card_text_cache: dict[str, dict] = {}
+http_session: aiohttp.ClientSession | None = None
+image_cache: OrderedDict[str, str] = OrderedDict()
+
 transport = GQL_Transport(url="https://gapi.arkhamcards.com/v1/graphql")
 gql_client = Client(transport=transport, fetch_schema_from_transport=True)
+IMAGE_URLS_QUERY = gql(
+    """query getCardImageURLs($codes: [String!]) { all_card(where: {code: {_in: $codes}}) { code imageurl } }"""
+)
+CARD_TEXT_QUERY = gql(
+    """query getCardText($id: String!) { all_card_text(where: {id: {_eq: $id}}) { back_flavor back_name back_text back_traits customization_change customization_text encounter_name taboo_original_back_text taboo_original_text taboo_text_change } }"""
+)
 
-def load_json_data() -> dict:
+def load_json_data() -> dict[str, list[Ruling]]:
     # This function should load from the new processed_rulings_v3_ai_enriched.json
     # or whatever the final data source for the app will be.
     # For now, keeping it as processed_data.json to avoid breaking existing logic
     # until model.py loading is fully integrated.
     """
     Load and return card rulings data from the local JSON file.
+
+    Each ruling is flattened into a slotted `Ruling` record whose `search_text` holds the lowercased text, question and answer, so searches can match case-insensitively without re-lowercasing the corpus on every keystroke. The markup of each field is parsed up front as well, so the `parse_special_tags` cache is warm before the first search.
+
+    The records are pickled to `PROCESSED_DATA_CACHE_PATH` together with the JSON file's modification time and size and `RULING_FORMAT_VERSION`. Later starts load the pickle instead of parsing the JSON as long as neither the JSON file nor the record format changed. The pickle is written to a temporary file and moved into place, so concurrently starting workers never see a partial cache.
     
     Returns:
-        dict: Parsed JSON data containing card rulings and related information.
+        dict[str, list[Ruling]]: Mapping of card names to their rulings.
     """
-    logging.info("Loading JSON data from file.")
-    with Path("assets/processed_data.json").open(encoding="utf-8") as file:
-        data = json.load(file)
-    logging.info("JSON data loaded successfully.")
+    source_path = constants.OLD_PROCESSED_DATA_PATH
+    cache_path = constants.PROCESSED_DATA_CACHE_PATH
+    source_stat = source_path.stat()
+    # The format version and the record's field names are part of the key, so a cache written before the record layout
+    # or its derivation changed is not reused.
+    source_key = (
+        RULING_FORMAT_VERSION, source_stat.st_mtime_ns, source_stat.st_size, tuple(Ruling.__dataclass_fields__)
+    )
+
+    data = None
+    try:
+        with cache_path.open("rb") as file:
+            # The cache is written by this function only; the key is read first so stale data is never unpickled.
+            if pickle.load(file) == source_key: # noqa: S301
+                data = pickle.load(file) # noqa: S301
+    except FileNotFoundError:
+        pass
+    except (OSError, EOFError, ValueError, pickle.UnpicklingError) as error:
+        logging.warning("Ignoring unreadable data cache %s: %s", cache_path, error)
+
+    if data is not None:
+        logging.info("JSON data loaded from cache.")
+    else:
+        logging.info("Loading JSON data from file.")
+        data = {
+            card_name: [Ruling.from_json(entry) for entry in card_entries]
+            for card_name, card_entries in orjson.loads(source_path.read_bytes()).items()
+        }
+        # Per-process temporary name: workers starting together each write their own file, and os.replace swaps it in atomically.
+        temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        try:
+            with temp_path.open("wb") as file:
+                pickle.dump(source_key, file, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(data, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+        except OSError as error:
+            logging.warning("Could not write data cache %s: %s", cache_path, error)
+            temp_path.unlink(missing_ok=True)
+        logging.info("JSON data loaded successfully.")
+
+    for card_rulings in data.values():
+        for ruling in card_rulings:
+            for field_text in (ruling.text, ruling.question, ruling.answer):
+                if field_text:
+                    parse_special_tags(field_text)
     return data
 
+def highlighted_style(style: ft.TextStyle) -> ft.TextStyle:
+    """
+    Return a copy of the given style with the search highlight background, reusing the precomputed copy for shared styles.
+    """
+    return HIGHLIGHTED_STYLES.get(id(style)) or replace(style, bgcolor=HIGHLIGHT_BGCOLOR)
+
 def highlight_text(span: ft.TextSpan, search_term: str) -> list[ft.TextSpan]:
     """
     Highlight occurrences of a search term within a TextSpan, returning new spans with background color applied to matches.
@@ -106,51 +214,43 @@ def highlight_text(span: ft.TextSpan, search_term: str) -> list[ft.TextSpan]:
     Returns:
     	list[ft.TextSpan]: A list of text spans with highlighted matches.
     """
-    term_pattern = reg.escape(search_term, special_only=True, literal_spaces=True)
-    for tag_name_in_dict, icon_char in TAG_TO_LETTER.items(): # Corrected variable name
-        if (
-            search_term.lower() in tag_name_in_dict # Check against keys like "willpower"
-            and span.style
-            and span.style.font_family == "Arkham Icons"
-            and span.text == icon_char
-        ):
-            span.style.bgcolor = ft.colors.with_opacity(0.5, ft.colors.TERTIARY)
+    if span.style and span.style.font_family == "Arkham Icons":
+        tag_name = LETTER_TO_TAG.get(span.text)
+        if tag_name and search_term.lower() in tag_name: # Check against keys like "willpower"
+            span.style = highlighted_style(span.style)
             return [span]
 
-    compiled_term_pattern = reg.compile(term_pattern, reg.IGNORECASE) # Compile pattern once
     span_text = span.text
-    spans = []
-    span_style = span.style if span.style else ft.TextStyle() # Ensure span_style is not None
-    highlight_style = deepcopy(span_style)
-    highlight_style.bgcolor = ft.colors.with_opacity(0.5, ft.colors.TERTIARY)
-
     if not span_text:
         return []
+    if not search_term:
+        return [span]
 
-    remaining_text = span_text
-    while match := compiled_term_pattern.search(remaining_text): # Use compiled pattern
-        start, end = match.span()
-        if start > 0:
-            pre_span = deepcopy(span)
-            pre_span.text = remaining_text[:start]
-            spans.append(pre_span)
-
-        mid_span = deepcopy(span)
-        mid_span.text = remaining_text[start:end]
-        mid_span.style = highlight_style
-        spans.append(mid_span)
+    # Plain substring search on lowercased copies: no per-call regex compile, and user input is never treated as a pattern.
+    text_lc = span_text.lower()
+    term_lc = search_term.lower()
+    if len(text_lc) != len(span_text): # Lowercasing changed the length, so offsets would not line up; match case-sensitively
+        text_lc, term_lc = span_text, search_term
 
-        remaining_text = remaining_text[end:]
-        if not remaining_text:
-            break
-
-    if remaining_text:
-        end_span = deepcopy(span)
-        end_span.text = remaining_text
-        spans.append(end_span)
+    spans = []
+    highlight_style = highlighted_style(span.style or PLAIN_STYLE)
+
+    # Segments are rebuilt from the source span's fields: the style is shared (see the module-level styles), and copying
+    # the whole span graph with deepcopy would dominate highlighting time.
+    on_click, url = span.on_click, span.url
+    position = 0
+    while (start := text_lc.find(term_lc, position)) != -1:
+        end = start + len(term_lc)
+        if start > position:
+            spans.append(ft.TextSpan(text=span_text[position:start], style=span.style, on_click=on_click, url=url))
+        spans.append(ft.TextSpan(text=span_text[start:end], style=highlight_style, on_click=on_click, url=url))
+        position = end
+
+    if spans and position < len(span_text):
+        spans.append(ft.TextSpan(text=span_text[position:], style=span.style, on_click=on_click, url=url))
 
     return spans if spans else [span] # Return original span if no matches, to keep content
-async def highlight_spans(text_spans: list[ft.TextSpan], search_term: str) -> list[ft.TextSpan]:
+def highlight_spans(text_spans: list[ft.TextSpan], search_term: str) -> list[ft.TextSpan]:
     """
     Highlights all occurrences of a search term within a list of TextSpan objects.
     
@@ -163,7 +263,7 @@ async def highlight_spans(text_spans: list[ft.TextSpan], search_term: str) -> li
     """
     highlighted_spans = []
     for span_item in text_spans: # Renamed span to span_item
-        highlighted_spans.extend(await highlight_text(span_item, search_term))
+        highlighted_spans.extend(highlight_text(span_item, search_term))
     return highlighted_spans
 
 def append_span(spans_list: list[ft.TextSpan], text_content: str, style: ft.TextStyle | None = None, on_click_handler=None) -> None: # Renamed variables
@@ -177,19 +277,111 @@ def append_span(spans_list: list[ft.TextSpan], text_content: str, style: ft.Text
         on_click_handler (callable, optional): An optional click event handler for the TextSpan.
     """
     if text_content:
-        spans_list.append(ft.TextSpan(text=text_content, style=style or ft.TextStyle(), on_click=on_click_handler))
+        spans_list.append(ft.TextSpan(text=text_content, style=style or PLAIN_STYLE, on_click=on_click_handler))
 
-async def replace_special_tags(page: ft.Page, text_input: str) -> list[ft.TextSpan]:
+@lru_cache(maxsize=None)
+def parse_special_tags(text_input: str) -> tuple[tuple[str, str, str | None], ...]:
+    """
+    Split raw ruling text into `(kind, text, target)` segments in a single pass over the combined markup pattern.
+
+    `kind` is one of "text", "card_link", "link", "tag", "bold_italic", "bolded" or "italics". `target` is only set for links: the card code for card links, and the absolute URL for other links. Icon tags are already translated to their Arkham Icons glyph. Results are cached per text, so each ruling is parsed once for the lifetime of the process rather than on every search.
+
+    Parameters:
+        text_input (str): The raw ruling text containing markdown, links and icon tags.
+
+    Returns:
+        tuple[tuple[str, str, str | None], ...]: The segments of the text, in order.
+    """
+    segments = []
+    position = 0
+    for match in ALL_PATTERN.finditer(text_input):
+        start, end = match.span()
+        if start > position:
+            segments.append(("text", text_input[position:start], None))
+        position = end
+
+        if link_text := match.group("link_text"):
+            link_url = match.group("link_url")
+            if "/card/" in link_url:
+                segments.append(("card_link", link_text, link_url.rsplit("/card/", 1)[-1]))
+            elif link_url.startswith("http"):
+                segments.append(("link", link_text, link_url))
+            else:
+                segments.append(("link", link_text, f"https://arkhamdb.com/{link_url.lstrip('/')}"))
+        elif tag := match.group("tag"):
+            segments.append(("tag", BRACKET_TAG_TO_LETTER[tag], None))
+        elif text := match.group(match.lastgroup):
+            segments.append((match.lastgroup, text, None))
+
+    if position < len(text_input):
+        segments.append(("text", text_input[position:], None))
+    return tuple(segments)
+
+def replace_special_tags(page: ft.Page, text_input: str) -> list[ft.TextSpan]:
+    """
+    Parses input text for special tags, markdown styles, and links, converting them into styled TextSpan objects for display.
+
+    Card links open the card image dialog when clicked, other links open their URL, icon tags are rendered with the Arkham Icons font, and bold/italic markdown is applied as a text style.
+
+    Parameters:
+        page (ft.Page): The Flet page that card link click handlers operate on.
+        text_input (str): The raw ruling text containing markdown, links and icon tags.
+
+    Returns:
+        list[ft.TextSpan]: The styled spans representing the input text.
     """
-     """
-     Parses input text for special tags, markdown styles, and links, converting them into styled TextSpan objects for display.
+    spans = []
+    for kind, text, target in parse_special_tags(text_input):
+        if kind == "card_link":
+            spans.append(ft.TextSpan(text=text, style=LINK_STYLE, on_click=partial(on_card_click, page=page, card_id=target)))
+        elif kind == "link":
+            spans.append(ft.TextSpan(text=text, style=LINK_STYLE, url=target))
+        else:
+            spans.append(ft.TextSpan(text=text, style=SEGMENT_STYLES[kind]))
+    return spans
+
+def merge_adjacent_spans(text_spans: list[ft.TextSpan]) -> list[ft.TextSpan]:
+    """
+    Collapse runs of adjacent plain TextSpans that share the same style into a single TextSpan.
+
+    Spans carrying a click handler, a URL or nested spans are never merged, so links keep working. Runs of a single span are passed through unchanged.
+
+    Parameters:
+        text_spans (list[ft.TextSpan]): The spans to collapse, in display order.
+
+    Returns:
+        list[ft.TextSpan]: An equivalent, usually shorter, list of spans.
+    """
+    merged_spans: list[ft.TextSpan] = []
+    current_run: list[ft.TextSpan] = []
+
+    def flush_run() -> None:
+        if len(current_run) == 1:
+            merged_spans.append(current_run[0])
+        elif current_run:
+            merged_spans.append(
+                ft.TextSpan(text="".join(span.text or "" for span in current_run), style=current_run[0].style)
+            )
+        current_run.clear()
+
+    for span_item in text_spans:
+        if span_item.on_click is not None or span_item.url or span_item.spans:
+            flush_run()
+            merged_spans.append(span_item)
+            continue
+        if current_run and span_item.style != current_run[0].style:
+            flush_run()
+        current_run.append(span_item)
+    flush_run()
+    return merged_spans
+
 async def on_card_click(event: ft.ControlEvent, page: ft.Page, card_id: str) -> None:
     """
     Displays a modal dialog with the card image when a card is clicked.
     
     Opens an alert dialog containing the card's image, retrieved asynchronously by card ID, and provides a close button to dismiss the dialog.
     """
-    logging.info(f"Card clicked with ID: {card_id}")
+    logging.info("Card clicked with ID: %s", card_id)
     image_url = await retrieve_image_url(card_id)
     dialog_ref = ft.Ref[ft.AlertDialog]() # Create a ref for the dialog
 
@@ -220,6 +412,24 @@ async def on_card_click(event: ft.ControlEvent, page: ft.Page, card_id: str) ->
     dialog.open = True
     await page.update_async()
 
+def get_http_session() -> aiohttp.ClientSession:
+    """
+    Return the process-wide aiohttp session used for image downloads, creating it on first use.
+
+    Reusing one session keeps connections to the image host alive between card clicks instead of paying a new TCP and TLS handshake for every image. It must first be called from inside the running event loop.
+    """
+    global http_session
+    if http_session is None or http_session.closed:
+        http_session = aiohttp.ClientSession()
+    return http_session
+
+async def close_http_session() -> None:
+    """
+    Close the shared aiohttp session, if one was opened.
+    """
+    if http_session is not None and not http_session.closed:
+        await http_session.close()
+
 async def retrieve_image_binary(image_url: str) -> str:
     """
     Fetch an image from the specified URL and return its content as a base64-encoded ASCII string.
@@ -229,21 +439,48 @@ async def retrieve_image_binary(image_url: str) -> str:
     
     Returns:
         str: Base64-encoded ASCII string of the image content, or an empty string if retrieval fails.
+
+    Successful downloads are kept in a small in-memory LRU cache (`IMAGE_CACHE_SIZE` entries), so reopening a recently viewed card needs no network request.
     """
-    import aiohttp
+    if (cached_image := image_cache.get(image_url)) is not None:
+        image_cache.move_to_end(image_url)
+        return cached_image
+
+    try:
+        async with get_http_session().get(image_url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            if response.status != 200:
+                logging.error("Image URL: %s returned status code: %s", image_url, response.status)
+                return ""
+            logging.info("Image URL: %s returned status code: %s", image_url, response.status)
+            image_data = await response.read()
+            image = b64encode(image_data).decode("ascii")
+            image_cache[image_url] = image
+            if len(image_cache) > constants.IMAGE_CACHE_SIZE:
+                image_cache.popitem(last=False)
+            return image
+    except Exception as e:
+        logging.error("Failed to retrieve image from %s: %s", image_url, e)
+        return ""
+async def retrieve_image_urls(card_ids: list[str]) -> dict[str, str]:
+    """
+    Fetches the image URLs for several cards with a single GraphQL query.
+
+    Parameters:
+        card_ids (list[str]): The unique identifiers of the cards.
+
+    Returns:
+        dict[str, str]: Image URL by card ID, for every card that has one. Cards without an image are left out.
+
+    Found URLs are cached for the lifetime of the process, since a card's image URL does not change; only IDs missing from the cache are sent to the server.
+    """
+    missing_ids = sorted({card_id for card_id in card_ids if card_id not in image_url_cache})
+    if missing_ids:
+        gql_result = await gql_client.execute_async(IMAGE_URLS_QUERY, variable_values={"codes": missing_ids})
+        for card in (gql_result or {}).get("all_card") or []:
+            if card.get("code") and card.get("imageurl"):
+                image_url_cache[card["code"]] = str(card["imageurl"]) # Ensure it's a string
+    return {card_id: image_url_cache[card_id] for card_id in card_ids if card_id in image_url_cache}
 
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.get(image_url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                if response.status != 200:
-                    logging.error(f"Image URL: {image_url} returned status code: {response.status}")
-                    return ""
-                logging.info(f"Image URL: {image_url} returned status code: {response.status}")
-                image_data = await response.read()
-                return b64encode(image_data).decode("ascii")
-        except Exception as e:
-            logging.error(f"Failed to retrieve image from {image_url}: {e}")
-            return ""
 async def retrieve_image_url(card_id: str) -> str | None: # Return None if not found
     """
     Fetches the image URL for a card using its card ID via a GraphQL query.
@@ -254,13 +491,9 @@ async def retrieve_image_url(card_id: str) -> str | None: # Return None if not f
     Returns:
     	str | None: The image URL as a string if found, otherwise None.
     """
-    gql_query = gql(f"""query getCardImageURL {{ all_card(where: {{code: {{_eq: "{card_id}"}}}}) {{ imageurl }} }}""")
-    gql_result = await gql_client.execute_async(gql_query)
-    if gql_result and "all_card" in gql_result and gql_result["all_card"] and "imageurl" in gql_result["all_card"][0]:
-        image_url = gql_result["all_card"][0]["imageurl"]
-        if image_url:
-            return str(image_url) # Ensure it's a string
-    logging.error(f"No image URL found for card_id: {card_id}")
+    if image_url := (await retrieve_image_urls([card_id])).get(card_id):
+        return image_url
+    logging.error("No image URL found for card_id: %s", card_id)
     return None
 
 async def retrieve_card_text(card_id: str) -> dict | None: # Return None if not found
@@ -272,12 +505,16 @@ async def retrieve_card_text(card_id: str) -> dict | None: # Return None if not
     
     Returns:
     	dict | None: A dictionary containing card text fields if found, otherwise None.
+
+    Found card texts are cached for the lifetime of the process.
     """
-    gql_query = gql(f"""query getCardText {{ all_card_text(where: {{id: {{_eq: "{card_id}"}}}}) {{ back_flavor back_name back_text back_traits customization_change customization_text encounter_name taboo_original_back_text taboo_original_text taboo_text_change }} }}""")
-    gql_result = await gql_client.execute_async(gql_query)
+    if (card_text := card_text_cache.get(card_id)) is not None:
+        return card_text
+    gql_result = await gql_client.execute_async(CARD_TEXT_QUERY, variable_values={"id": card_id})
     if gql_result and "all_card_text" in gql_result and gql_result["all_card_text"]:
-        return gql_result["all_card_text"][0]
-    logging.error(f"No card text results found for card_id: {card_id}")
+        card_text_cache[card_id] = gql_result["all_card_text"][0]
+        return card_text_cache[card_id]
+    logging.error("No card text results found for card_id: %s", card_id)
     return None
 
 async def copy_ruling_to_clipboard(event: ft.ControlEvent, ruling_text_content: str, button_to_style: ft.IconButton) -> None: # Renamed params
@@ -291,15 +528,31 @@ async def copy_ruling_to_clipboard(event: ft.ControlEvent, ruling_text_content:
     logging.info("Copying ruling to clipboard.")
     clipman.copy(ruling_text_content)
     if button_to_style: # Check if button exists
-        button_to_style.style.shadow = ft.BoxShadow(
-            spread_radius=-1, blur_radius=10, color=ft.colors.BLACK,
-            offset=ft.Offset(2, 2), blur_style=ft.ShadowBlurStyle.NORMAL,
-        )
+        # Swap between the shared styles rather than editing the button's style, which every copy button shares.
+        button_to_style.style = COPY_BUTTON_COPIED_STYLE
         await button_to_style.update_async()
         await asyncio.sleep(0.3)
-        button_to_style.style.shadow = None
+        button_to_style.style = COPY_BUTTON_STYLE
         await button_to_style.update_async()
 
+def make_copy_button(ruling_text: str, ruling_question: str, ruling_answer: str) -> ft.IconButton:
+    """
+    Create the copy-to-clipboard button shown next to a ruling.
+
+    Parameters:
+        ruling_text (str): The ruling text. When empty, the question and answer are copied instead.
+        ruling_question (str): The question of a question/answer ruling.
+        ruling_answer (str): The answer of a question/answer ruling.
+
+    Returns:
+        ft.IconButton: A button using the shared copy button style that copies the ruling when clicked.
+    """
+    copy_button = ft.IconButton(icon=ft.icons.COPY, icon_size=20, tooltip="Copy ruling", style=COPY_BUTTON_STYLE)
+    ruling_text_content = ruling_text or rf"Q: {ruling_question}\n A: {ruling_answer}"
+    # The handler needs the button itself to flash it, so it is bound after the button exists.
+    copy_button.on_click = partial(copy_ruling_to_clipboard, ruling_text_content=ruling_text_content, button_to_style=copy_button)
+    return copy_button
+
 async def go_to_card_page(event: ft.ControlEvent, page: ft.Page, card_code: str, card_name: str) -> None:
     """
     Navigates asynchronously to the detailed view of a card using its code and name.
@@ -310,20 +563,23 @@ async def go_to_card_page(event: ft.ControlEvent, page: ft.Page, card_code: str,
     await page.update_async()
 
 class SearchController:
-    def __init__(self, page: ft.Page, data: dict[str, list[dict]]) -> None:
+    def __init__(self, page: ft.Page, page_content: ft.Column, data: dict[str, list[Ruling]], search_index: RulingSearchIndex | None = None) -> None:
         """
-        Initialize the SearchController with the Flet page and card rulings data.
+        Initialize the SearchController with the Flet page, its results column and card rulings data.
         
         Parameters:
             page (ft.Page): The Flet page instance for UI updates.
-            data (dict[str, list[dict]]): Dictionary mapping card names to lists of ruling entries.
+            page_content (ft.Column): The column of the root view that search results are rendered into.
+            data (dict[str, list[Ruling]]): Dictionary mapping card names to lists of ruling entries.
+            search_index (RulingSearchIndex | None): Prebuilt index over `data`. Built on first search if not provided.
         """
         logging.info("Initializing SearchController.") # Corrected class name
         self.page = page
-        self.page_content: ft.Column = page.views[0].controls[1] # This might be fragile
+        self.page_content = page_content
         self.data = data
+        self.search_index = search_index
 
-    async def create_text_spans(self, ruling_type: EntryType, search_term: str | None, ruling_text_content: str = "", question_or_answer: QAType | None = None) -> list[ft.TextSpan]: # Added None to search_term
+    def create_text_spans(self, ruling_type: EntryType, search_term: str | None, ruling_text_content: str = "", question_or_answer: QAType | None = None) -> list[ft.TextSpan]: # Added None to search_term
         """
         Generate a list of styled TextSpan objects for a ruling, optionally highlighting a search term.
         
@@ -342,32 +598,26 @@ class SearchController:
         if ruling_type == EntryType.QUESTION_ANSWER:
             ruling_type_name = question_or_answer.title() if question_or_answer else "Entry"
 
-        text_spans = [ft.TextSpan(text=f"{ruling_type_name}: ", style=ft.TextStyle(weight=ft.FontWeight.BOLD))]
-        ruling_text_control_spans = await replace_special_tags(self.page, ruling_text_content)
+        text_spans = [ft.TextSpan(text=f"{ruling_type_name}: ", style=BOLD_STYLE)]
+        ruling_text_control_spans = replace_special_tags(self.page, ruling_text_content)
         if search_term: # Only highlight if search_term is provided
-            ruling_text_control_spans = await highlight_spans(ruling_text_control_spans, search_term)
-        text_spans.extend(ruling_text_control_spans)
+            ruling_text_control_spans = highlight_spans(ruling_text_control_spans, search_term)
+        # Highlighting splits spans at every match; fold same-styled neighbours back together
+        # so Flet has fewer controls to serialize and send to the client.
+        text_spans.extend(merge_adjacent_spans(ruling_text_control_spans))
         return text_spans
 
-    async def update_search_view(self, search_term: str) -> None:
+    async def update_search_view(self, search_term: str, is_stale: Callable[[], bool] | None = None) -> None:
 
         """
         Update the search results view to display card rulings matching the provided search term.
         
-        Filters all card rulings for matches with the search term (case-insensitive), groups results by card, and displays each matching ruling with a copy-to-clipboard button and highlighted search terms. If no results are found, displays a message indicating no matches. Updates the page asynchronously.
-        """
-        def _create_copy_button_lambda(btn_ruling_text, btn_ruling_question, btn_ruling_answer, btn_instance: ft.IconButton):
-            # This inner function is needed because lambdas capture variables by name from the enclosing scope at definition time
-            # but we need to pass the button *instance* that the lambda is attached to.
-            # However, the button instance isn't fully defined when the lambda is defined.
-            # A workaround is to have the button call a method that then knows about the button.
-            # For now, we pass the button instance to the copy_ruling_to_clipboard.
-            rules_text_content = btn_ruling_text or rf"Q: {btn_ruling_question}\n A: {btn_ruling_answer}"
-            return lambda e: asyncio.create_task(copy_ruling_to_clipboard(e, rules_text_content, btn_instance))
-
-        self.page_content.scroll = None # Consider ft.ScrollMode.ADAPTIVE or ft.ScrollMode.AUTO
-        self.page_content.controls.clear()
+        Filters all card rulings for matches with the search term (case-insensitive), groups results by card, and displays each matching ruling with a copy-to-clipboard button and highlighted search terms. If no results are found, displays a message indicating no matches. The page is updated every `SEARCH_RESULTS_BATCH_SIZE` rulings as results are added, and once more at the end.
 
+        Parameters:
+            search_term (str): The term to search for and highlight.
+            is_stale (Callable[[], bool] | None): Checked once the lookup finishes and before every page update; when it returns True a newer search has started and this render stops without touching the page again.
+        """
         content_controls = ft.ListView(controls=[], expand=True, spacing=10)
         if not search_term:
             logging.warning("update_search_view called with empty search_term.")
@@ -376,26 +626,32 @@ class SearchController:
             # await self.page.update_async()
             # return
 
-        for card_name, card_rulings in tqdm(self.data.items(), total=len(self.data), desc="Processing cards"):
+        if self.search_index is None:
+            self.search_index = RulingSearchIndex(self.data)
+        # The lookup is pure CPU work; keep it off the event loop so the UI stays responsive.
+        matching_rulings = await asyncio.to_thread(self.search_index.search, search_term)
+        if is_stale and is_stale():
+            return
+
+        self.page_content.scroll = None # Consider ft.ScrollMode.ADAPTIVE or ft.ScrollMode.AUTO
+        self.page_content.controls.clear()
+        self.page_content.controls.append(ft.Text(spans=[ft.TextSpan("Search results for "), ft.TextSpan(f'"{search_term}"')], theme_style=ft.TextThemeStyle.HEADLINE_MEDIUM))
+        self.page_content.controls.append(content_controls)
+        # Push results to the client in batches so the first matches show up without waiting for the whole list.
+        rulings_since_update = 0
+        if logging.getLogger().isEnabledFor(logging.DEBUG): # Progress bars cost a lock and a clock read per item
+            matching_rulings = tqdm(matching_rulings, desc="Processing rulings")
+        for card_name, card_hits in groupby(matching_rulings, key=itemgetter(0)):
             card_added = False
             card_specific_controls = [] # Controls for the current card
 
-            for _i, ruling in enumerate(card_rulings):
-                ruling_content = ruling.get("content", {})
-                ruling_type_str = ruling.get("type", EntryType.UNKNOWN.value)
-                try:
-                    ruling_type = EntryType(ruling_type_str)
-                except ValueError:
-                    ruling_type = EntryType.UNKNOWN
+            for _card_name, ruling in card_hits:
+                ruling_type = ENTRY_TYPES.get(ruling.ruling_type, EntryType.UNKNOWN)
 
-                ruling_text_val = ruling_content.get("text", "") # Renamed to avoid conflict
-                ruling_question = ruling_content.get("question", "")
-                ruling_answer = ruling_content.get("answer", "")
-                card_id = ruling.get("card_code", "")
-
-                current_ruling_text_for_search = f"{ruling_text_val} {ruling_question} {ruling_answer}"
-                if search_term.lower() not in current_ruling_text_for_search.lower():
-                    continue
+                ruling_text_val = ruling.text # Renamed to avoid conflict
+                ruling_question = ruling.question
+                ruling_answer = ruling.answer
+                card_id = ruling.card_code
 
                 if not card_added:
                     card_added = True
@@ -403,8 +659,8 @@ class SearchController:
                         ft.Text(
                             spans=[
                                 ft.TextSpan(
-                                    card_name, style=ft.TextStyle(decoration=ft.TextDecoration.UNDERLINE),
-                                    on_click=lambda e, name=card_name, code=card_id: asyncio.create_task(go_to_card_page(e, self.page, code, name))
+                                    card_name, style=CARD_TITLE_STYLE,
+                                    on_click=partial(go_to_card_page, page=self.page, card_code=card_id, card_name=card_name)
                                 )
                             ],
                             theme_style=ft.TextThemeStyle.TITLE_MEDIUM, selectable=True
@@ -412,22 +668,19 @@ class SearchController:
                     )
 
                 text_spans_for_display = []
-                copy_button = ft.IconButton(icon=ft.icons.COPY, icon_size=20, tooltip="Copy ruling")
-                # The lambda needs to correctly capture rule_text, question, answer for *this* button
-                full_ruling_text_for_copy = ruling_text_val or rf"Q: {ruling_question}\n A: {ruling_answer}"
-                copy_button.on_click = lambda e, rt=full_ruling_text_for_copy, btn=copy_button: asyncio.create_task(copy_ruling_to_clipboard(e, rt, btn))
+                copy_button = make_copy_button(ruling_text_val, ruling_question, ruling_answer)
 
                 text_spans_for_display.append(copy_button)
 
 
                 if ruling_type == EntryType.QUESTION_ANSWER:
                     if ruling_question:
-                        text_spans_for_display.extend(await self.create_text_spans(ruling_type, search_term, ruling_question, QAType.QUESTION))
+                        text_spans_for_display.extend(self.create_text_spans(ruling_type, search_term, ruling_question, QAType.QUESTION))
                         text_spans_for_display.append(ft.TextSpan(text="\n"))
                     if ruling_answer:
-                        text_spans_for_display.extend(await self.create_text_spans(ruling_type, search_term, ruling_answer, QAType.ANSWER))
+                        text_spans_for_display.extend(self.create_text_spans(ruling_type, search_term, ruling_answer, QAType.ANSWER))
                 elif ruling_text_val:
-                    text_spans_for_display.extend(await self.create_text_spans(ruling_type, search_term, ruling_text_val))
+                    text_spans_for_display.extend(self.create_text_spans(ruling_type, search_term, ruling_text_val))
                 else: # Fallback for UNKNOWN or empty
                      text_spans_for_display.append(ft.TextSpan("Ruling content appears empty or unknown."))
 
@@ -438,20 +691,24 @@ class SearchController:
                         # padding=ft.padding.symmetric(vertical=5) # Add some padding
                     )
                 )
+                rulings_since_update += 1
 
             if card_added:
                 content_controls.controls.append(ft.Column(card_specific_controls, spacing=5))
                 content_controls.controls.append(ft.Divider(height=10, thickness=2))
-
-
-        self.page_content.controls.clear()
-        self.page_content.controls.append(ft.Text(spans=[ft.TextSpan("Search results for "), ft.TextSpan(f'"{search_term}"')], theme_style=ft.TextThemeStyle.HEADLINE_MEDIUM))
-
+                if rulings_since_update >= constants.SEARCH_RESULTS_BATCH_SIZE:
+                    if is_stale and is_stale():
+                        return
+                    rulings_since_update = 0
+                    await self.page.update_async()
+                    await asyncio.sleep(0) # Let pending input events run, so a newer keystroke can cancel this render
+
+        if is_stale and is_stale():
+            return
         if not content_controls.controls:
-            logging.info(f"No search results found for term: {search_term}")
+            logging.info("No search results found for term: %s", search_term)
             content_controls.controls.append(ft.Text("No results found."))
 
-        self.page_content.controls.append(content_controls)
         await self.page.update_async()
         # await self.page_content.update_async() # page.update_async() should cover this
 
@@ -469,39 +726,28 @@ class SearchController:
         Returns:
         	list[ft.Control]: A list of Flet UI controls representing the card's rulings, each with copy-to-clipboard functionality and styled text. If no rulings are found, returns a message indicating this.
         """
-        def _create_copy_button_lambda_for_card_view(btn_ruling_text, btn_ruling_question, btn_ruling_answer, btn_instance: ft.IconButton):
-            rules_text_content = btn_ruling_text or rf"Q: {btn_ruling_question}\n A: {btn_ruling_answer}"
-            return lambda e: asyncio.create_task(copy_ruling_to_clipboard(e, rules_text_content, btn_instance))
-
         card_rulings_list = self.data.get(card_name, [])
         display_controls = []
 
         for ruling in card_rulings_list:
-            ruling_content = ruling.get("content", {})
-            ruling_type_str = ruling.get("type", EntryType.UNKNOWN.value)
-            try:
-                ruling_type = EntryType(ruling_type_str)
-            except ValueError:
-                ruling_type = EntryType.UNKNOWN
+            ruling_type = ENTRY_TYPES.get(ruling.ruling_type, EntryType.UNKNOWN)
 
-            ruling_text_val = ruling_content.get("text", "")
-            ruling_question = ruling_content.get("question", "")
-            ruling_answer = ruling_content.get("answer", "")
+            ruling_text_val = ruling.text
+            ruling_question = ruling.question
+            ruling_answer = ruling.answer
 
             text_spans = []
-            copy_button = ft.IconButton(icon=ft.icons.COPY, icon_size=20, tooltip="Copy ruling")
-            full_ruling_text_for_copy = ruling_text_val or rf"Q: {ruling_question}\n A: {ruling_answer}"
-            copy_button.on_click = lambda e, rt=full_ruling_text_for_copy, btn=copy_button: asyncio.create_task(copy_ruling_to_clipboard(e, rt, btn))
+            copy_button = make_copy_button(ruling_text_val, ruling_question, ruling_answer)
             text_spans.append(copy_button)
 
             if ruling_type == EntryType.QUESTION_ANSWER:
                 if ruling_question:
-                    text_spans.extend(await self.create_text_spans(ruling_type, None, ruling_question, QAType.QUESTION))
+                    text_spans.extend(self.create_text_spans(ruling_type, None, ruling_question, QAType.QUESTION))
                     text_spans.append(ft.TextSpan(text="\n"))
                 if ruling_answer:
-                    text_spans.extend(await self.create_text_spans(ruling_type, None, ruling_answer, QAType.ANSWER))
+                    text_spans.extend(self.create_text_spans(ruling_type, None, ruling_answer, QAType.ANSWER))
             elif ruling_text_val:
-                 text_spans.extend(await self.create_text_spans(ruling_type, None, ruling_text_val))
+                 text_spans.extend(self.create_text_spans(ruling_type, None, ruling_text_val))
             else:
                 text_spans.append(ft.TextSpan(f"({ruling_type.title()}) Content missing."))
 
@@ -512,26 +758,158 @@ class SearchController:
 
 
 class SearchInputController:
-    def __init__(self, page: ft.Page, data: dict[str, list[dict]]) -> None:
+    def __init__(self, page: ft.Page, page_content: ft.Column, data: dict[str, list[Ruling]], search_index: RulingSearchIndex | None = None) -> None:
         """
-        Initialize the SearchInputController with the given Flet page and card rulings data.
+        Initialize the SearchInputController with the given Flet page, the column search results go into and card rulings data, indexing the rulings for search unless a prebuilt index is given.
         """
         logging.info("Initializing SearchInputController.") # Corrected class name
         self.data = data
         self.page = page
+        self.search_index = search_index if search_index is not None else RulingSearchIndex(data)
+        self._latest_search_id = 0
+        # Shared by searches and card routes so it is only constructed once per session
+        self.search_controller = SearchController(page, page_content, data, self.search_index)
 
-    @debounce(1.0)
     async def search_input_changed(self, event: ft.ControlEvent) -> None:
         """
         Handles changes to the search input field and updates the search results view with matching rulings.
         
-        This method is debounced to limit update frequency during rapid input changes.
+        The search is debounced to limit update frequency during rapid input changes, and the debounce also cancels this page's search if one is still running. Every change gets a new search id as well, so stale results never reach the page.
         """
-        if search_term := event.control.value:
-            # Use SearchController, not SearchView
-            search_controller = SearchController(self.page, self.data)
-            await search_controller.update_search_view(search_term)
+        self._latest_search_id += 1
+        await self._run_search(event.control.value, self._latest_search_id)
+
+    @debounce(constants.SEARCH_DEBOUNCE_SECONDS)
+    async def _run_search(self, search_term: str, search_id: int) -> None:
+        if search_term:
+            try:
+                await self.search_controller.update_search_view(search_term, is_stale=lambda: search_id != self._latest_search_id)
+            except asyncio.CancelledError:
+                # A newer keystroke took over; partial results stay until its render replaces them.
+                logging.debug("Search for %r cancelled by newer input.", search_term)
+                raise
+
+
+def index_rulings(index: FileIndex, data: dict[str, list[Ruling]]) -> None:
+    """
+    Add every ruling to a freshly created Whoosh index in a single writer transaction.
+
+    The writer's memory budget and process count come from `WHOOSH_LIMITMB` and `WHOOSH_PROCS`, which can be set through environment variables of the same name for large bulk builds.
+
+    Parameters:
+        index (FileIndex): The empty index to fill.
+        data (dict[str, list[Ruling]]): Mapping of card names to their rulings, as returned by `load_json_data`.
+    """
+    writer = index.writer(
+        limitmb=constants.WHOOSH_LIMITMB, procs=constants.WHOOSH_PROCS, multisegment=constants.WHOOSH_PROCS > 1
+    )
+    add_document = writer.add_document
+    try:
+        for card_name, card_rulings in tqdm(data.items(), desc="Indexing cards"):
+            for ruling in card_rulings:
+                add_document(
+                    card_name=card_name,
+                    ruling_text=ruling.text,
+                    card_code=ruling.card_code,
+                    ruling_type=ruling.ruling_type,
+                    ruling_question=ruling.question,
+                    ruling_answer=ruling.answer,
+                )
+    except BaseException:
+        writer.cancel()
+        raise
+    # This is a bulk load into a freshly created index: there are no older segments worth merging or optimizing.
+    writer.commit(merge=False, optimize=False)
+
+def _file_sha256(path: Path) -> str:
+    with path.open("rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
 
+def open_whoosh_index(data: dict[str, list[Ruling]]) -> FileIndex:
+    """
+    Open the Whoosh index in `INDEX_DIR`, rebuilding it only if `processed_data.json` changed since it was built.
+
+    A successful build records the source file's modification time, size and SHA-256 in `INDEX_DIR/.source_stamp`. When the stamp's time and size still match, the existing index is opened as is. When only they differ, the file is hashed; if the contents are unchanged, the stamp is refreshed and the index reused. Otherwise the index is recreated and refilled with `index_rulings`, and the stamp is written after the commit, so an interrupted build is never mistaken for a complete one.
+
+    Parameters:
+        data (dict[str, list[Ruling]]): Mapping of card names to their rulings, as returned by `load_json_data`.
+
+    Returns:
+        FileIndex: The up-to-date index, also stored in the module-level `ix`, which stays None until it is ready.
+    """
+    global ix
+    source_path = constants.OLD_PROCESSED_DATA_PATH
+    index_dir = constants.INDEX_DIR
+    stamp_path = index_dir / ".source_stamp"
+    source_stat = source_path.stat()
+    stamp = {"mtime_ns": source_stat.st_mtime_ns, "size": source_stat.st_size}
+
+    try:
+        previous_stamp = orjson.loads(stamp_path.read_bytes())
+    except FileNotFoundError:
+        previous_stamp = None
+    except (OSError, orjson.JSONDecodeError) as error:
+        logging.warning("Ignoring unreadable index stamp %s: %s", stamp_path, error)
+        previous_stamp = None
+
+    if isinstance(previous_stamp, dict) and exists_in(index_dir):
+        if all(previous_stamp.get(key) == value for key, value in stamp.items()):
+            logging.info("Whoosh index is up to date.")
+            ix = open_dir(index_dir)
+            return ix
+        stamp["sha256"] = _file_sha256(source_path)
+        if previous_stamp.get("sha256") == stamp["sha256"]:
+            logging.info("Whoosh index is up to date; source file was only touched.")
+            stamp_path.write_bytes(orjson.dumps(stamp))
+            ix = open_dir(index_dir)
+            return ix
+
+    if "sha256" not in stamp:
+        stamp["sha256"] = _file_sha256(source_path)
+    logging.info("Building Whoosh index.")
+    index_dir.mkdir(parents=True, exist_ok=True)
+    # Remove the old stamp first, so a build that fails part way leaves the index marked as stale.
+    stamp_path.unlink(missing_ok=True)
+    ix = create_in(index_dir, schema)
+    index_rulings(ix, data)
+    stamp_path.write_bytes(orjson.dumps(stamp))
+    return ix
+
+def build_whoosh_index_in_background(data: dict[str, list[Ruling]]) -> threading.Thread:
+    """
+    Open or rebuild the Whoosh index with `open_whoosh_index` on a daemon thread.
+
+    Interactive search runs on `RulingSearchIndex`, so nothing has to wait for the Whoosh index; building it on the event loop would block every session until it finished. If the process exits mid-build, the source stamp is never written and the next start rebuilds the index.
+
+    Parameters:
+        data (dict[str, list[Ruling]]): Mapping of card names to their rulings, as returned by `load_json_data`.
+
+    Returns:
+        threading.Thread: The started thread.
+    """
+    def build() -> None:
+        try:
+            open_whoosh_index(data)
+        except Exception:
+            logging.exception("Building the Whoosh index failed.")
+
+    thread = threading.Thread(target=build, name="whoosh-index", daemon=True)
+    thread.start()
+    return thread
+
+@lru_cache(maxsize=1)
+def load_app_data() -> tuple[dict[str, list[Ruling]], RulingSearchIndex]:
+    """
+    Load the card rulings and build both search indexes, once per process.
+
+    Every Flet session used to reload the JSON and re-add all rulings to the Whoosh index, so each new browser tab duplicated the whole index. The result is now cached and shared by all sessions, and the Whoosh index on disk is only rebuilt when the source data changed, on a background thread.
+
+    Returns:
+        tuple[dict[str, list[Ruling]], RulingSearchIndex]: The rulings by card name and the in-memory index used for interactive search.
+    """
+    data = load_json_data()
+    build_whoosh_index_in_background(data)
+    return data, RulingSearchIndex(data)
 
 async def main_flet_app(page: ft.Page) -> None: # Renamed main to main_flet_app
     """
@@ -579,25 +957,11 @@ async def main_flet_app(page: ft.Page) -> None: # Renamed main to main_flet_app
     )
 
     page_content_ref = ft.Ref[ft.Column]() # Use Ref
-    json_data = load_json_data()
-
-    # Indexing (consider doing this once at startup, not per page load if main_flet_app is called multiple times)
-    # For a desktop app, this is fine. For web, this might be inefficient.
-    # Use existing ix variable created at module level
-    print("Creating/Opening index.")
-    with AsyncWriter(ix) as writer:
-        for card_name, card_rulings in tqdm(json_data.items(), desc="Indexing cards"):
-            for ruling in card_rulings:
-                writer.add_document(
-                    card_name=card_name,
-                    ruling_text=ruling.get("content", {}).get("text", ""),
-                    card_code=ruling.get("card_code", ""),
-                    ruling_type=ruling.get("type", EntryType.UNKNOWN.value),
-                    ruling_question=ruling.get("content", {}).get("question", ""),
-                    ruling_answer=ruling.get("content", {}).get("answer", ""),
-                )
+    # Loaded and indexed once per process; every session shares the same data and search index.
+    json_data, search_index = load_app_data()
 
-    search_input_handler = SearchInputController(page, json_data)
+    page_content = ft.Column(ref=page_content_ref, expand=True, scroll=ft.ScrollMode.ADAPTIVE) # Content area
+    search_input_handler = SearchInputController(page, page_content_ref.current, json_data, search_index)
     search_input = ft.TextField(
         hint_text="Type to search...",
         on_change=search_input_handler.search_input_changed, # Directly pass the method
@@ -607,11 +971,8 @@ async def main_flet_app(page: ft.Page) -> None: # Renamed main to main_flet_app
     root_view_controls = [
         ft.AppBar(title=ft.Text("FAQ This!"), bgcolor=ft.colors.SURFACE_VARIANT),
         ft.Row([search_input]), # Search input at the top
-        ft.Column(ref=page_content_ref, expand=True, scroll=ft.ScrollMode.ADAPTIVE), # Content area
+        page_content,
     ]
-    # Ensure page_content_ref is assigned if SearchController relies on it being in page.views[0]
-    # This structure is a bit different now.
-    # The SearchController might need to be adapted to find its target Column if not page.views[0].controls[1]
 
     page.views.append(ft.View("/", root_view_controls))
     await page.update_async()
@@ -627,8 +988,6 @@ async def main_flet_app(page: ft.Page) -> None: # Renamed main to main_flet_app
         # page.views.clear() # This would clear the root view with search
         # page.views.append(root_view) # Keep root view
 
-        current_page_content_column = page_content_ref.current # Get the current column to update
-
         troute = ft.TemplateRoute(route_event.route)
         if troute.match("/card/:card_name_b64/:card_code"): # Use a different param name
             card_code = troute.card_code
@@ -641,9 +1000,7 @@ async def main_flet_app(page: ft.Page) -> None: # Renamed main to main_flet_app
 
             card_text_content = await retrieve_card_text(card_code) # Renamed card_text
 
-            # Use SearchController, not SearchView
-            search_controller = SearchController(page, json_data) # json_data needs to be accessible
-            ruling_controls = await search_controller.get_rulings_for_card(page, card_name, card_code, image_binary_data, card_text_content)
+            ruling_controls = await search_input_handler.search_controller.get_rulings_for_card(page, card_name, card_code, image_binary_data, card_text_content)
 
             # Create new view for card details
             card_detail_view_content = [
@@ -691,12 +1048,39 @@ async def main_flet_app(page: ft.Page) -> None: # Renamed main to main_flet_app
     await page.go_async(page.route)
 
 
+def use_eager_tasks() -> None:
+    """
+    Make the server's event loop start new tasks eagerly.
+
+    Keystroke, route and click handlers are all wrapped in tasks; an eager task runs synchronously up to its first real suspension instead of waiting for its turn in the ready queue, and one that finishes without suspending never gets scheduled at all.
+    """
+    loop = asyncio.get_running_loop()
+    loop.set_task_factory(asyncio.eager_task_factory)
+    logging.info("Task factory installed: %s", loop.get_task_factory())
+
 logging.info("Starting app.")
 print("Starting app")
-flet_path = os.getenv("FLET_PATH", DEFAULT_FLET_PATH)
-flet_port = int(os.getenv("FLET_PORT", DEFAULT_FLET_PORT))
+flet_path = os.getenv("FLET_PATH", constants.DEFAULT_FLET_PATH)
+flet_port = int(os.getenv("FLET_PORT", constants.DEFAULT_FLET_PORT))
 # Pass main_flet_app to flet_fastapi.app
 app = flet_fastapi.app(main_flet_app, assets_dir=str(Path(__file__).parent / "assets"), web_renderer=ft.WebRenderer.HTML)
+flet_lifespan = app.router.lifespan_context
+
+@asynccontextmanager
+async def lifespan(fastapi_app: FastAPI) -> AsyncIterator[None]:
+    """
+    Run the app's own startup and teardown around the lifespan flet_fastapi installs for its session manager.
+
+    Starlette ignores `on_startup`/`on_shutdown` handlers once an app has a lifespan, so this work has to be wrapped around flet_fastapi's lifespan instead.
+    """
+    use_eager_tasks()
+    try:
+        async with flet_lifespan(fastapi_app):
+            yield
+    finally:
+        await close_http_session()
+
+app.router.lifespan_context = lifespan
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"],
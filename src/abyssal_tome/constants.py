@@ -5,8 +5,10 @@ This module centralizes project-wide constants including paths, regex patterns,
 icon mappings, and configuration values used across multiple scripts and modules.
 """
 
+import os
 from pathlib import Path
 import re
+import uuid
 
 # --- Project Root ---
 # Assuming constants.py is in src/abyssal_tome/
@@ -17,6 +19,8 @@ ASSETS_DIR = PROJECT_ROOT / "assets"
 FAQS_DIR = PROJECT_ROOT / "faqs"
 SCHEMAS_DIR = ASSETS_DIR / "schemas"
 INDEX_DIR = PROJECT_ROOT / "indexdir" # For Whoosh index
+WHOOSH_LIMITMB = int(os.getenv("WHOOSH_LIMITMB", "256")) # Memory budget per Whoosh indexing process, in MB
+WHOOSH_PROCS = int(os.getenv("WHOOSH_PROCS", "1")) # Whoosh indexing processes; >1 also writes one segment per process
 
 # --- File Paths ---
 FAQS_FILE_PATH = FAQS_DIR / "faqs.json"
@@ -27,6 +31,7 @@ PROCESSED_RULINGS_V3_AI_PATH = ASSETS_DIR / "processed_rulings_v3_ai_enriched.js
 RAW_EXTERNAL_RULINGS_PATH = ASSETS_DIR / "raw_external_rulings.json"
 OPINIONATED_RULINGS_PATH = ASSETS_DIR / "opinionated_rulings.json"
 OLD_PROCESSED_DATA_PATH = ASSETS_DIR / "processed_data.json" # Original processed data for main.py
+PROCESSED_DATA_CACHE_PATH = ASSETS_DIR / "processed_data.pkl" # Pickled, annotated copy of OLD_PROCESSED_DATA_PATH written by the Flet app
 
 # Schema files
 RULING_SCHEMA_JSON = SCHEMAS_DIR / "ruling_schema.json"
@@ -70,6 +75,10 @@ TAG_TO_LETTER: dict[str, str] = {
 # --- Constants for scripts/enrich_rulings_ai.py ---
 DEFAULT_SOURCE_CARD_CODE_EXTERNAL = "00000"
 
+# --- Ruling ids (process_new_format.py and enrich_rulings_ai.py) ---
+# Namespace for the uuid5 ruling ids, so rerunning the pipeline on the same input yields the same ids
+RULING_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "https://github.com/Folia-Labs/abyssal-tome/rulings")
+
 
 # --- Constants for scripts/scrape_arkhamdb_faq.py ---
 # Regex patterns for replacing HTML elements
@@ -104,3 +113,6 @@ CYCLES_MAP: dict[str, str] = {
 # --- Flet App specific constants (from main.py/app.py) ---
 DEFAULT_FLET_PATH = ""
 DEFAULT_FLET_PORT = 8502
+SEARCH_DEBOUNCE_SECONDS = 0.15 # Quiet period after the last keystroke before a search runs
+SEARCH_RESULTS_BATCH_SIZE = 50 # Rulings rendered between page updates while streaming search results
+IMAGE_CACHE_SIZE = 64 # Card images kept in memory after being shown in the card dialog
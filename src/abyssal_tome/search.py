@@ -0,0 +1,119 @@
+"""In-memory ruling records and the search index over them used by the Flet app."""
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+NGRAM_SIZE = 3
+# Part of the key of the app's pickled data cache. Bump it whenever `Ruling.from_json` changes how records are derived,
+# so caches built by the old code are rebuilt even though the JSON file itself did not change.
+RULING_FORMAT_VERSION = 1
+
+
+@dataclass(slots=True, frozen=True)
+class Ruling:
+    """
+    One ruling from `processed_data.json`, flattened out of its nested `content` dict.
+
+    `search_text` holds the lowercased text, question and answer joined by NUL characters; it is what `RulingSearchIndex` matches against.
+    """
+
+    ruling_type: str
+    text: str
+    question: str
+    answer: str
+    card_code: str
+    search_text: str
+
+    @classmethod
+    def from_json(cls, entry: dict) -> "Ruling":
+        """
+        Build a ruling from one entry of the processed JSON data.
+
+        Parameters:
+            entry (dict): A ruling as stored in `processed_data.json`, with `type`, `card_code` and a `content` dict.
+
+        Returns:
+            Ruling: The flattened ruling. Missing fields become empty strings; a missing type becomes "unknown".
+        """
+        content = entry.get("content") or {}
+        text = content.get("text") or ""
+        question = content.get("question") or ""
+        answer = content.get("answer") or ""
+        return cls(
+            ruling_type=entry.get("type") or "unknown",
+            text=text,
+            question=question,
+            answer=answer,
+            card_code=entry.get("card_code") or "",
+            # The NUL separator cannot be typed into the search box, so no match can straddle two fields.
+            search_text="\0".join((text, question, answer)).lower(),
+        )
+
+
+def _ngrams(text: str) -> set[str]:
+    """
+    Return the set of distinct NGRAM_SIZE-character substrings of the given text.
+    """
+    return {text[i : i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+class RulingSearchIndex:
+    """
+    Case-insensitive substring index over every ruling in the card → rulings mapping.
+
+    Rulings are flattened into a single list in card order. Every trigram of each ruling's `search_text` is mapped to the positions of the rulings containing it, so a search only has to verify the rulings whose posting lists all contain the term's trigrams instead of scanning the whole corpus.
+    """
+
+    def __init__(self, data: dict[str, list[Ruling]]) -> None:
+        """
+        Build the index from card rulings data as returned by `load_json_data`.
+
+        Parameters:
+            data (dict[str, list[Ruling]]): Mapping of card names to their rulings.
+        """
+        self.entries: list[tuple[str, Ruling]] = [
+            (card_name, ruling) for card_name, card_rulings in data.items() for ruling in card_rulings
+        ]
+        # One haystack per entry (parallel to `entries`), so a candidate is verified with a single substring scan.
+        self._haystacks: list[str] = [ruling.search_text for _card_name, ruling in self.entries]
+        # Stored as one tuple so lookups running in worker threads never see a term paired with another term's hits.
+        self._last_search: tuple[str, list[int]] = ("", [])
+        self._postings: dict[str, list[int]] = {}
+        for position, haystack in enumerate(self._haystacks):
+            for ngram in _ngrams(haystack):
+                self._postings.setdefault(ngram, []).append(position)
+
+    def _filter(self, positions: Iterable[int], term: str) -> list[int]:
+        haystacks = self._haystacks
+        return [position for position in positions if term in haystacks[position]]
+
+    def search(self, search_term: str) -> list[tuple[str, Ruling]]:
+        """
+        Find all rulings whose text, question or answer contains the search term, ignoring case.
+
+        The previous term and its hit positions are remembered. When the new term extends the previous one, as it does while the user keeps typing, its matches must be among the previous hits, so only those are re-checked instead of querying the index.
+
+        Parameters:
+            search_term (str): The term to look for.
+
+        Returns:
+            list[tuple[str, Ruling]]: Matching `(card_name, ruling)` pairs in the same order as the source data.
+        """
+        term = search_term.lower()
+        last_term, last_hits = self._last_search
+        if last_term and term.startswith(last_term):
+            candidates = last_hits
+        elif len(term) < NGRAM_SIZE:
+            candidates = range(len(self.entries))
+        else:
+            posting_lists = sorted((self._postings.get(ngram, []) for ngram in _ngrams(term)), key=len)
+            candidate_set = set(posting_lists[0])
+            for posting_list in posting_lists[1:]:
+                if not candidate_set:
+                    break
+                candidate_set.intersection_update(posting_list)
+            candidates = sorted(candidate_set)
+
+        hits = self._filter(candidates, term)
+        self._last_search = (term, hits)
+        return [self.entries[position] for position in hits]
@@ -1,10 +1,60 @@
 import asyncio
 import functools
+import json
+import logging
+import uuid
+from collections.abc import Callable, Coroutine
+from pathlib import Path
+from typing import Any
 
+from . import constants
 
-def debounce(wait):
+
+class _Debounced:
+    """
+    An async callable that runs the wrapped function only once calls have stopped for `wait` seconds.
+
+    Used as a method, every instance gets its own debounced copy (stored in the instance's `__dict__`, like
+    `functools.cached_property`), so calls on one object never cancel calls pending on another.
+    """
+
+    def __init__(self, fn: Callable[..., Coroutine[Any, Any, Any]], wait: float) -> None:
+        functools.update_wrapper(self, fn)
+        self._fn = fn
+        self._wait = wait
+        self._name = fn.__name__
+        self._timer: asyncio.TimerHandle | None = None
+        self._task: asyncio.Task | None = None
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._name = name
+
+    def __get__(self, instance: object | None, owner: type | None = None) -> "_Debounced":
+        if instance is None:
+            return self
+        bound = _Debounced(self._fn.__get__(instance, owner), self._wait)
+        instance.__dict__[self._name] = bound
+        return bound
+
+    async def __call__(self, *args: object, **kwargs: object) -> None:
+        # A new call supersedes both a pending timer and a run that is still in progress.
+        if self._timer is not None:
+            self._timer.cancel()
+        if self._task is not None:
+            self._task.cancel()
+
+        def start() -> None:
+            self._task = asyncio.create_task(self._fn(*args, **kwargs))
+
+        # A plain timer on the running loop: no coroutine or task exists until the quiet period has passed.
+        self._timer = asyncio.get_running_loop().call_later(self._wait, start)
+
+
+def debounce(wait: float) -> Callable[[Callable[..., Coroutine[Any, Any, Any]]], _Debounced]:
     """
     Decorator that debounces an asynchronous function, ensuring it is called only once after a specified delay.
+
+    When applied to a method, the delay and cancellation are tracked per instance.
     
     Parameters:
         wait (float): The delay in seconds to wait after the last call before executing the function.
@@ -12,19 +62,72 @@ def debounce(wait):
     Returns:
         Callable: A decorator that wraps an async function, delaying its execution and canceling any previous pending calls within the wait period.
     """
-    def decorator(fn):
-        @functools.wraps(fn)
-        async def debounced(*args, **kwargs) -> None:
-            debounced._task = getattr(debounced, "_task", None)
-            if debounced._task is not None:
-                debounced._task.cancel()
+    def decorator(fn: Callable[..., Coroutine[Any, Any, Any]]) -> _Debounced:
+        return _Debounced(fn, wait)
+
+    return decorator
 
-            async def task() -> None:
-                await asyncio.sleep(wait)
-                await fn(*args, **kwargs)
 
-            debounced._task = asyncio.create_task(task())
+def write_if_changed(path: Path, content: str, encoding: str = "utf-8") -> bool:
+    """
+    Write text to a file only if it differs from what is already on disk.
 
-        return debounced
+    The on-disk size is compared first, so most real changes are detected without reading the old file back.
 
-    return decorator
+    Parameters:
+        path (Path): The file to write.
+        content (str): The full text the file should contain.
+        encoding (str): The encoding used for the file. Defaults to UTF-8.
+
+    Returns:
+        bool: True if the file was written, False if it was already up to date.
+    """
+    data = content.encode(encoding)
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    path.write_bytes(data)
+    return True
+
+
+def stable_ruling_id(*parts: str | None) -> str:
+    """
+    Derive a ruling id from the fields that identify the ruling.
+
+    The id is a uuid5 in `RULING_ID_NAMESPACE`, so reprocessing the same source data yields the same ids and unchanged output files stay byte-identical.
+
+    Parameters:
+        *parts (str | None): The identifying fields, e.g. source, card code and content. None is treated as an empty string.
+
+    Returns:
+        str: The id as a UUID string.
+    """
+    return str(uuid.uuid5(constants.RULING_ID_NAMESPACE, "\0".join(part or "" for part in parts)))
+
+
+def load_retrieval_dates(path: Path) -> dict[str, str]:
+    """
+    Read the provenance retrieval date of every ruling in a previously written output file.
+
+    Rulings that are still present on a rerun keep their original retrieval date instead of being stamped with the current time.
+
+    Parameters:
+        path (Path): A JSON list of ruling dicts, as written by the processing scripts.
+
+    Returns:
+        dict[str, str]: Retrieval dates by ruling id. Empty if the file is missing or unreadable.
+    """
+    try:
+        rulings = json.loads(path.read_bytes())
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logging.warning("Ignoring unreadable previous output %s: %s", path, e)
+        return {}
+    return {
+        ruling["id"]: ruling["provenance"]["retrieval_date"]
+        for ruling in rulings
+        if isinstance(ruling, dict) and "id" in ruling and (ruling.get("provenance") or {}).get("retrieval_date")
+    }
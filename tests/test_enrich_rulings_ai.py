@@ -0,0 +1,62 @@
+import json
+import os
+
+from abyssal_tome import constants
+from scripts.enrich_rulings_ai import convert_external_ruling_to_standard_format, html_to_text, main
+
+
+def test_main_leaves_unchanged_output_untouched(tmp_path, monkeypatch) -> None:
+    processed_path = tmp_path / "processed_rulings_v2.json"
+    external_path = tmp_path / "raw_external_rulings.json"
+    output_path = tmp_path / "processed_rulings_v3_ai_enriched.json"
+    processed_path.write_text("[]", encoding="utf-8")
+    # No retrieval_date_utc, so the first run stamps the current time.
+    external_path.write_text(
+        json.dumps([{"raw_text": "Q: Can [01001] do this? A: Yes.", "source_url_or_context": "discord"}]),
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(constants, "PROCESSED_RULINGS_V2_PATH", processed_path)
+    monkeypatch.setattr(constants, "RAW_EXTERNAL_RULINGS_PATH", external_path)
+    monkeypatch.setattr(constants, "PROCESSED_RULINGS_V3_AI_PATH", output_path)
+
+    main()
+    first_output = output_path.read_bytes()
+    os.utime(output_path, ns=(0, 0))
+
+    main()
+    assert output_path.read_bytes() == first_output
+    assert output_path.stat().st_mtime_ns == 0
+
+
+def test_main_keeps_identical_external_rulings_apart(tmp_path, monkeypatch) -> None:
+    processed_path = tmp_path / "processed_rulings_v2.json"
+    external_path = tmp_path / "raw_external_rulings.json"
+    output_path = tmp_path / "processed_rulings_v3_ai_enriched.json"
+    processed_path.write_text("[]", encoding="utf-8")
+    entry = {"raw_text": "It can.", "source_url_or_context": "discord"}
+    external_path.write_text(json.dumps([entry, entry]), encoding="utf-8")
+    monkeypatch.setattr(constants, "PROCESSED_RULINGS_V2_PATH", processed_path)
+    monkeypatch.setattr(constants, "RAW_EXTERNAL_RULINGS_PATH", external_path)
+    monkeypatch.setattr(constants, "PROCESSED_RULINGS_V3_AI_PATH", output_path)
+
+    main()
+    first, second = json.loads(output_path.read_bytes())
+    assert first["id"] != second["id"]
+
+
+def test_convert_external_ruling_prefers_the_input_retrieval_date() -> None:
+    entry = {"raw_text": "It can.", "source_url_or_context": "discord"}
+    ruling_id = convert_external_ruling_to_standard_format(entry)["id"]
+    previous_retrieval_dates = {ruling_id: "2020-01-01T00:00:00"}
+
+    ruling = convert_external_ruling_to_standard_format(entry, 0, previous_retrieval_dates)
+    assert ruling["provenance"]["retrieval_date"] == "2020-01-01T00:00:00"
+
+    entry["retrieval_date_utc"] = "2024-05-06T07:08:09"
+    ruling = convert_external_ruling_to_standard_format(entry, 0, previous_retrieval_dates)
+    assert ruling["provenance"]["retrieval_date"] == "2024-05-06T07:08:09"
+
+
+def test_html_to_text_keeps_bare_angle_brackets() -> None:
+    assert html_to_text("Play it if its cost < 3 or > 1.") == "Play it if its cost < 3 or > 1."
+    assert html_to_text("<p>Cost <b>&lt; 3</b></p><!-- note -->") == "Cost < 3"
@@ -0,0 +1,30 @@
+from scripts.process_json import EntryType, process_ruling
+
+
+def test_process_ruling_converts_markup_in_questions_and_answers() -> None:
+    ruling = process_ruling(
+        r'<b>Q:</b> Does \"Roland\" get <i>+1</i> [willpower]?\n'
+        r"<b>A:</b> Yes, *_both_* \*you\* ~~not this~~",
+        "01001",
+        "Roland Banks",
+        "2024-01-02T03:04:05.000Z",
+    )
+    assert ruling["type"] == EntryType.QUESTION_ANSWER
+    assert ruling["content"] == {
+        "text": "",
+        "question": 'Does "Roland" get *+1* [willpower]?',
+        # Markdown emphasis, underscores and escaped asterisks are passed through untouched
+        "answer": r"Yes, *_both_* \*you\*",
+    }
+    assert ruling["source"] == {"updated": "02 January 2024", "type": None, "version": None}
+
+
+def test_process_ruling_extracts_faq_reference_from_erratum() -> None:
+    ruling = process_ruling(
+        r'<b>Erratum:</b> Should read \"<i>Fast.</i>\"\n\nFAQ, v.1.7, March 2020',
+        "01001",
+        "Roland Banks",
+    )
+    assert ruling["type"] == EntryType.ERRATUM
+    assert ruling["content"] == {"text": 'Should read "*Fast.*"', "question": "", "answer": ""}
+    assert ruling["source"] == {"updated": "March 2020", "type": "FAQ", "version": "1.7"}
@@ -0,0 +1,34 @@
+import json
+import os
+
+from abyssal_tome import constants
+from scripts.process_new_format import main
+
+
+def test_main_leaves_unchanged_output_untouched(tmp_path, monkeypatch) -> None:
+    faqs_path = tmp_path / "faqs.json"
+    output_path = tmp_path / "processed_rulings_v2.json"
+    # The same ruling twice on one card, so the ids must also tell identical rulings apart.
+    ruling_html = "<li><strong>Q:</strong> Can it do this? <strong>A:</strong> Yes.</li>"
+    faq = {"text": f"<ul>{ruling_html}{ruling_html}</ul>", "updated_at": "2024-01-01"}
+    faqs_path.write_text(json.dumps({"01001": faq}), encoding="utf-8")
+    monkeypatch.setattr(constants, "FAQS_FILE_PATH", faqs_path)
+    monkeypatch.setattr(constants, "PROCESSED_RULINGS_V2_PATH", output_path)
+
+    main()
+    first_output = output_path.read_bytes()
+    rulings = json.loads(first_output)
+    assert len(rulings) == 2
+    assert rulings[0]["id"] != rulings[1]["id"]
+    os.utime(output_path, ns=(0, 0))
+
+    main()
+    assert output_path.read_bytes() == first_output
+    assert output_path.stat().st_mtime_ns == 0
+
+    # Ids are derived from the rulings alone, not from the previous output.
+    output_path.unlink()
+    main()
+    assert [ruling["id"] for ruling in json.loads(output_path.read_bytes())] == [
+        ruling["id"] for ruling in rulings
+    ]
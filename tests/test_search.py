@@ -0,0 +1,60 @@
+import pytest
+
+from abyssal_tome.search import Ruling, RulingSearchIndex
+
+
+def _ruling(text: str = "", question: str = "", answer: str = "") -> Ruling:
+    return Ruling.from_json({"type": "clarification", "content": {"text": text, "question": question, "answer": answer}})
+
+
+@pytest.fixture
+def search_index() -> RulingSearchIndex:
+    data = {
+        "Roland Banks": [
+            _ruling(text="After you defeat an enemy, discover 1 clue."),
+            _ruling(question="Can Roland use [reaction] twice?", answer="No."),
+        ],
+        "Machete": [_ruling(text="Deal +1 damage if the attacked enemy is the only enemy engaged.")],
+        "Lucky!": [_ruling(question="Does it work on a failed test?", answer="Yes, it can turn a FAIL into a success.")],
+    }
+    return RulingSearchIndex(data)
+
+
+def test_search_is_case_insensitive_and_keeps_data_order(search_index) -> None:
+    hits = search_index.search("ENEMY")
+    assert [card_name for card_name, _ruling in hits] == ["Roland Banks", "Machete"]
+
+
+def test_search_matches_question_and_answer_fields(search_index) -> None:
+    assert [card for card, _ in search_index.search("twice")] == ["Roland Banks"]
+    assert [card for card, _ in search_index.search("into a success")] == ["Lucky!"]
+
+
+def test_search_short_terms_fall_back_to_scan(search_index) -> None:
+    assert [card for card, _ in search_index.search("+1")] == ["Machete"]
+    assert len(search_index.search("")) == 4
+
+
+def test_search_requires_contiguous_match(search_index) -> None:
+    # Both words occur in Roland's first ruling, but not next to each other.
+    assert search_index.search("enemy clue") == []
+    assert search_index.search("zzz") == []
+    # Question and answer are stored side by side, but a match must not span them.
+    assert search_index.search("twice?no") == []
+
+
+def test_search_narrows_previous_hits_while_typing(search_index) -> None:
+    assert [card for card, _ in search_index.search("en")] == ["Roland Banks", "Machete"]
+    assert [card for card, _ in search_index.search("enemy, ")] == ["Roland Banks"]
+    assert search_index.search("enemy, x") == []
+    # Backspacing past the previous term must query the index again.
+    assert [card for card, _ in search_index.search("enemy")] == ["Roland Banks", "Machete"]
+
+
+def test_ruling_from_json_flattens_content() -> None:
+    ruling = Ruling.from_json(
+        {"type": "question/answer", "card_code": "01006", "content": {"question": "Can I?", "answer": "YES."}}
+    )
+    assert (ruling.ruling_type, ruling.card_code, ruling.text) == ("question/answer", "01006", "")
+    assert ruling.search_text == "\0can i?\0yes."
+    assert Ruling.from_json({}).ruling_type == "unknown"
@@ -0,0 +1,85 @@
+import asyncio
+
+from abyssal_tome.utils import debounce, write_if_changed
+
+
+def test_debounce_runs_only_the_last_call() -> None:
+    calls = []
+
+    @debounce(0.01)
+    async def record(value: int) -> None:
+        calls.append(value)
+
+    async def type_quickly() -> None:
+        for value in range(5):
+            await record(value)
+        await asyncio.sleep(0.05)
+
+    asyncio.run(type_quickly())
+    assert calls == [4]
+
+
+def test_write_if_changed_creates_missing_file(tmp_path) -> None:
+    target = tmp_path / "out.json"
+    assert write_if_changed(target, '{"a": 1}')
+    assert target.read_text(encoding="utf-8") == '{"a": 1}'
+
+
+def test_write_if_changed_skips_identical_content(tmp_path) -> None:
+    target = tmp_path / "out.json"
+    target.write_text('{"a": 1}', encoding="utf-8")
+    mtime_before = target.stat().st_mtime_ns
+    assert not write_if_changed(target, '{"a": 1}')
+    assert target.stat().st_mtime_ns == mtime_before
+
+
+def test_write_if_changed_rewrites_same_size_content(tmp_path) -> None:
+    target = tmp_path / "out.json"
+    target.write_text('{"a": 1}', encoding="utf-8")
+    assert write_if_changed(target, '{"a": 2}')
+    assert target.read_text(encoding="utf-8") == '{"a": 2}'
+
+
+def test_debounce_is_per_instance() -> None:
+    class Field:
+        def __init__(self) -> None:
+            self.calls = []
+
+        @debounce(0.01)
+        async def changed(self, value: int) -> None:
+            self.calls.append(value)
+
+    first, second = Field(), Field()
+
+    async def type_in_both() -> None:
+        await first.changed(1)
+        await second.changed(2)
+        await first.changed(3)
+        await asyncio.sleep(0.05)
+
+    asyncio.run(type_in_both())
+    assert first.calls == [3]
+    assert second.calls == [2]
+
+
+def test_debounce_cancels_the_running_call() -> None:
+    events = []
+
+    @debounce(0.01)
+    async def search(value: int) -> None:
+        events.append(f"start {value}")
+        try:
+            await asyncio.sleep(0.1)
+        except asyncio.CancelledError:
+            events.append(f"cancel {value}")
+            raise
+        events.append(f"done {value}")
+
+    async def type_during_search() -> None:
+        await search(1)
+        await asyncio.sleep(0.03)
+        await search(2)
+        await asyncio.sleep(0.2)
+
+    asyncio.run(type_during_search())
+    assert events == ["start 1", "cancel 1", "start 2", "done 2"]